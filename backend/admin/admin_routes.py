@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 import os
 from admin.auth import create_token, admin_required
-from utils.google_sheets import tutors_sheet
+from config.sheets import repository, write_behind, tutor_cache
+from storage import TUTORS, PendingWrites
+from models.responses import admin_view
+from utils.admin_index import MAX_ADMIN_PAGE_SIZE, SORT_FIELDS
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
@@ -41,6 +44,18 @@ class TutorVerify(BaseModel):
     verified: bool
 
 
+class BulkTutorChange(BaseModel):
+    """One row of a bulk edit: address it by `row` or `profile_id`."""
+    row: Optional[int] = Field(None, ge=2)
+    profile_id: Optional[str] = None
+    verified: Optional[bool] = None
+    fields: Optional[TutorUpdate] = None
+
+
+class BulkTutorUpdate(BaseModel):
+    changes: List[BulkTutorChange] = Field(..., min_length=1, max_length=1000)
+
+
 # -------------------------
 # Routes
 # -------------------------
@@ -59,14 +74,57 @@ def admin_login(data: AdminLogin):
     raise HTTPException(status_code=401, detail="Invalid credentials")
 
 
+def get_admin_index():
+    snapshot = tutor_cache.get()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Tutors are still loading")
+    return snapshot.admin
+
+
 @router.get("/tutors")
 def get_all_tutors_admin(user=Depends(admin_required)):
-    try:
-        records = tutors_sheet.get_all_records(empty2zero=False, head=1)
-        print("Fetched tutors:", records)  # Log the records to verify structure
-        return records
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching tutors: {e}")
+    """
+    Every Tutors row (verified or not), served from the shared snapshot.
+    """
+    return get_admin_index().rows
+
+
+@router.get("/tutors/list")
+def list_tutors_admin(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=MAX_ADMIN_PAGE_SIZE),
+    sort: str = Query("date_added", pattern="^(" + "|".join(SORT_FIELDS) + ")$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    verified: Optional[bool] = None,
+    province: Optional[str] = None,
+    subject: Optional[str] = None,
+    user=Depends(admin_required),
+):
+    """
+    Paginated, sortable admin listing from the shared tutor snapshot,
+    including unverified rows. Returns `items`, `total`, `page`, `page_size`.
+    """
+    return get_admin_index().query(
+        verified=verified,
+        province=province,
+        subject=subject,
+        sort=sort,
+        descending=order == "desc",
+        page=page,
+        page_size=page_size,
+    )
+
+
+@router.get("/tutors/profile/{profile_id}")
+def get_tutor_admin(profile_id: str, user=Depends(admin_required)):
+    """
+    One verified tutor with contact and identity fields (the admin projection).
+    """
+    snapshot = tutor_cache.get()
+    tutor = snapshot.get(profile_id) if snapshot is not None else None
+    if tutor is None:
+        raise HTTPException(status_code=404, detail="Tutor not found")
+    return admin_view(tutor)
 
 
 @router.put("/tutors/{row}")
@@ -79,15 +137,14 @@ def update_tutor(row: int, data: TutorUpdate, user=Depends(admin_required)):
     try:
         print(f"Updating tutor at row {row} with data: {updated_fields}")
 
-        # Iterate through updated fields and update only those columns
-        for key, value in updated_fields.items():
-            cell = tutors_sheet.find(key)
-            if not cell:
-                continue
-            tutors_sheet.update_cell(row, cell.col, value)
+        # Update only the changed columns
+        repository.update_cells(TUTORS, row, updated_fields)
+        tutor_cache.trigger(force=True)
 
         return {"success": True, "updated_fields": list(updated_fields.keys())}
 
+    except PendingWrites as e:
+        raise HTTPException(status_code=409, detail=f"Try again shortly: {e}")
     except Exception as e:
         print(f"Error updating tutor: {e}")
         raise HTTPException(status_code=500, detail=f"Error updating tutor: {e}")
@@ -98,9 +155,84 @@ def verify_tutor(row: int, data: TutorVerify, user=Depends(admin_required)):
     """
     Verify or unverify a tutor.
     """
-    cell = tutors_sheet.find("Verified")
-    if not cell:
+    try:
+        written = repository.update_cells(TUTORS, row, {"Verified": "Yes" if data.verified else "No"})
+    except PendingWrites as e:
+        raise HTTPException(status_code=409, detail=f"Try again shortly: {e}")
+    if not written:
         raise HTTPException(status_code=500, detail="Verified column not found in sheet")
 
-    tutors_sheet.update_cell(row, cell.col, "Yes" if data.verified else "No")
+    tutor_cache.trigger(force=True)
     return {"row": row, "verified": data.verified}
+
+
+@router.post("/tutors/bulk")
+def bulk_update_tutors(data: BulkTutorUpdate, user=Depends(admin_required)):
+    """
+    Verify/unverify and/or edit many tutors in one batched sheet write.
+    Returns a result per requested change, in request order.
+    """
+    results: List[Dict] = []
+    changes: Dict[int, Dict] = {}
+    # One lookup for every Profile ID (and the row count), not a search per change
+    wanted = [c.profile_id for c in data.changes if c.row is None and c.profile_id]
+    found, last_row = repository.find_rows(TUTORS, wanted)
+
+    for change in data.changes:
+        result = {"row": change.row, "profile_id": change.profile_id, "success": False}
+        results.append(result)
+
+        row = change.row
+        if row is None and change.profile_id:
+            row = found.get(str(change.profile_id).strip())
+            if row is None:
+                result["error"] = "Profile ID not found"
+                continue
+        if row is None:
+            result["error"] = "Either row or profile_id is required"
+            continue
+        if row > last_row:
+            result["error"] = "Row does not exist"
+            continue
+
+        fields = change.fields.dict(exclude_unset=True) if change.fields else {}
+        if change.verified is not None:
+            fields["Verified"] = "Yes" if change.verified else "No"
+        if not fields:
+            result["error"] = "No fields to update"
+            continue
+
+        result["row"] = row
+        changes.setdefault(row, {}).update(fields)
+
+    if changes:
+        try:
+            written = repository.update_rows(TUTORS, changes)
+        except PendingWrites as e:
+            raise HTTPException(status_code=409, detail=f"Try again shortly: {e}")
+        except Exception as e:
+            print(f"Error in bulk tutor update: {e}")
+            raise HTTPException(status_code=500, detail=f"Error updating tutors: {e}")
+
+        for result in results:
+            if "error" not in result:
+                fields = written.get(result["row"], [])
+                result["success"] = bool(fields)
+                result["updated_fields"] = fields
+                if not fields:
+                    result["error"] = "No matching columns"
+        tutor_cache.trigger(force=True)
+
+    return {
+        "updated": sum(1 for r in results if r["success"]),
+        "failed": sum(1 for r in results if not r["success"]),
+        "results": results,
+    }
+
+
+@router.get("/write-queue")
+def write_queue_status(user=Depends(admin_required)):
+    """
+    Rows journaled locally and waiting to be flushed to Google Sheets.
+    """
+    return write_behind.status()
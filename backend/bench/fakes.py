@@ -0,0 +1,259 @@
+"""
+Local stand-ins for every remote service the app talks to.
+
+`install()` must run before `main` (or any `config.*` module) is imported:
+settings are read from the environment at import time, and Nominatim is
+wired up then too. After it, the app runs fully offline:
+
+    gspread     -> storage.fake_sheet.FakeSpreadsheet with generated rows
+    reCAPTCHA   -> FakeRecaptchaClient (tokens look like "<action>:<nonce>")
+    Nominatim   -> fake_reverse
+    imgbb,
+    ipapi.co,
+    tutor photos -> httpx.MockTransport behind config.http_client
+
+Each service blocks for its configured latency (seconds) per call, the
+same way the real one would, so latency-bound code paths stay visible.
+"""
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+GAZETTEER_FILE = os.path.join(BENCH_DIR, "..", "gazetteer.json")
+
+# Rough medians of the real services as seen from our host
+DEFAULT_LATENCY = {
+    "sheets": 0.3,
+    "recaptcha": 0.15,
+    "nominatim": 0.5,
+    "imgbb": 0.8,
+    "ipapi": 0.2,
+    "images": 0.2,
+}
+
+IMAGE_HOST = "images.bench.local"
+
+TUTOR_HEADERS = [
+    "Date Added", "Profile ID", "Profile URL", "Full Name", "ID Card Number",
+    "Qualification", "Subject", "Major Subjects", "Experience", "Phone", "Bio",
+    "Province", "District", "Tehsil", "City", "Latitude", "Longitude",
+    "Image URL", "Verified",
+]
+JOB_HEADERS = ["Job ID", "title", "subject", "city", "fee", "status", "posted"]
+
+FIRST_NAMES = ["Ayesha", "Bilal", "Fatima", "Hamza", "Hira", "Imran", "Maryam", "Usman", "Zainab", "Ali"]
+LAST_NAMES = ["Khan", "Ahmed", "Butt", "Malik", "Qureshi", "Sheikh", "Raza", "Iqbal", "Chaudhry", "Shah"]
+QUALIFICATIONS = ["BS", "MS", "MA", "MSc", "MPhil", "PhD", "BEd", "MEd"]
+SUBJECTS = ["Mathematics", "Physics", "Chemistry", "Biology", "English", "Urdu", "Computer Science", "Economics"]
+
+
+# ----------------------------
+# Data
+# ----------------------------
+def load_places() -> List[Dict]:
+    with open(GAZETTEER_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_tutor_rows(count: int, seed: int = 1, verified_ratio: float = 0.8) -> List[List]:
+    """Header + `count` tutor rows spread around the gazetteer's district HQs."""
+    rng = random.Random(seed)
+    places = load_places()
+    rows = [list(TUTOR_HEADERS)]
+    for i in range(count):
+        place = rng.choice(places)
+        subject = rng.choice(SUBJECTS)
+        majors = rng.sample(SUBJECTS, 3)
+        profile_id = f"TPA-{i + 1:06d}"
+        rows.append([
+            f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            profile_id,
+            f"https://theprofessoracademy.com/tutors/{profile_id}",
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            f"35{i:011d}",
+            f"{rng.choice(QUALIFICATIONS)} {subject}",
+            subject,
+            ",".join(majors),
+            f"{rng.randint(1, 20)} years",
+            f"0300{rng.randint(1_000_000, 9_999_999)}",
+            " ".join(["Experienced tutor."] * rng.randint(1, 8)),
+            place["province"],
+            place["district"],
+            place["tehsil"],
+            place["city"],
+            f"{place['lat'] + rng.uniform(-0.05, 0.05):.5f}",
+            f"{place['lng'] + rng.uniform(-0.05, 0.05):.5f}",
+            f"https://{IMAGE_HOST}/{profile_id}.jpg",
+            "Yes" if rng.random() < verified_ratio else "No",
+        ])
+    return rows
+
+
+def make_job_rows(count: int, seed: int = 1) -> List[List]:
+    rng = random.Random(seed)
+    places = load_places()
+    rows = [list(JOB_HEADERS)]
+    for i in range(count):
+        rows.append([
+            f"JOB-{i + 1:05d}",
+            f"{rng.choice(SUBJECTS)} tutor needed",
+            rng.choice(SUBJECTS),
+            rng.choice(places)["city"],
+            str(rng.randint(5, 40) * 1000),
+            "open" if rng.random() < 0.6 else "closed",
+            f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        ])
+    return rows
+
+
+def make_jpeg(size: int = 600, seed: int = 0) -> bytes:
+    """A photo-sized JPEG (gradient + noise, so it does not compress to nothing)."""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    img = Image.new("RGB", (size, size))
+    img.putdata([
+        ((x * 255) // size, (y * 255) // size, rng.randint(0, 255))
+        for y in range(size) for x in range(size)
+    ])
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+# ----------------------------
+# Google services
+# ----------------------------
+class FakeGspreadClient:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def open_by_key(self, key: str):
+        return self.spreadsheet
+
+
+class FakeRecaptchaClient:
+    """Accepts every token; the expected action is encoded in the token itself."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def create_assessment(self, request=None, timeout=None, **kwargs):
+        time.sleep(self.latency)
+        token = request.assessment.event.token
+        action = token.split(":", 1)[0]
+        return SimpleNamespace(
+            token_properties=SimpleNamespace(valid=True, action=action),
+            risk_analysis=SimpleNamespace(score=0.9),
+        )
+
+
+def fake_reverse(latency: float):
+    def reverse(self, query, **kwargs):
+        time.sleep(latency)
+        return SimpleNamespace(raw={"address": {
+            "city": "Bench City",
+            "county": "Bench District",
+            "state": "Bench Province",
+            "suburb": "Bench Tehsil",
+        }})
+    return reverse
+
+
+# ----------------------------
+# HTTP (imgbb, ipapi.co, tutor photos)
+# ----------------------------
+def mock_transport(latency: Dict[str, float], photo: bytes):
+    import httpx
+
+    uploads = iter(range(1, 10**9))
+
+    async def handler(request: "httpx.Request") -> "httpx.Response":
+        host = request.url.host
+        if host == "api.imgbb.com":
+            await asyncio.sleep(latency["imgbb"])
+            url = f"https://{IMAGE_HOST}/uploads/{next(uploads)}.jpg"
+            return httpx.Response(200, json={"success": True, "data": {"url": url}})
+        if host == "ipapi.co":
+            await asyncio.sleep(latency["ipapi"])
+            ip = request.url.path.strip("/").split("/")[0]
+            return httpx.Response(200, json={
+                "ip": ip, "city": "Lahore", "region": "Punjab", "country_name": "Pakistan",
+                "latitude": 31.5204, "longitude": 74.3587,
+            })
+        if host == IMAGE_HOST or host.endswith(".workers.dev"):
+            await asyncio.sleep(latency["images"])
+            return httpx.Response(200, content=photo, headers={"Content-Type": "image/jpeg"})
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+# ----------------------------
+# Install
+# ----------------------------
+def install(
+    rows: int = 1000,
+    jobs: int = 200,
+    latency: Optional[Dict[str, float]] = None,
+    seed: int = 1,
+    data_dir: Optional[str] = None,
+) -> Dict[str, float]:
+    """
+    Point every remote dependency at a local fake. Returns the latencies
+    in effect (DEFAULT_LATENCY overridden by `latency`).
+    """
+    latency = {**DEFAULT_LATENCY, **(latency or {})}
+    data_dir = data_dir or tempfile.mkdtemp(prefix="tpa-bench-")
+
+    # Settings read these at import; real credentials are never needed
+    env = {
+        "SERVICE_ACCOUNT_JSON": "{}",
+        "RECAPTCHA_SERVICE_ACCOUNT_JSON": "{}",
+        "GCLOUD_PROJECT_ID": "bench",
+        "RECAPTCHA_SITE_KEY_TPA": "bench",
+        "SHEET_ID": "bench",
+        "IMGBB_API_KEY": "bench",
+        "SQLITE_PATH": os.path.join(data_dir, "store.db"),
+        "JOURNAL_PATH": os.path.join(data_dir, "journal.db"),
+        "THUMBNAIL_CACHE_DIR": os.path.join(data_dir, "thumbnails"),
+        "IP_DB_PATH": "",
+        "LOG_LEVEL": "WARNING",
+    }
+    os.environ.update(env)
+
+    import gspread
+    from google.oauth2.service_account import Credentials
+    from google.cloud import recaptchaenterprise_v1
+    from geopy.geocoders import Nominatim
+
+    from storage.fake_sheet import FakeSpreadsheet
+
+    spreadsheet = FakeSpreadsheet(
+        {"Tutors": make_tutor_rows(rows, seed), "Jobs": make_job_rows(jobs, seed)},
+        latency=latency["sheets"],
+    )
+    gspread.authorize = lambda credentials, **kwargs: FakeGspreadClient(spreadsheet)
+    Credentials.from_service_account_info = classmethod(lambda cls, info, **kwargs: object())
+    recaptchaenterprise_v1.RecaptchaEnterpriseServiceClient.from_service_account_info = classmethod(
+        lambda cls, info, **kwargs: FakeRecaptchaClient(latency["recaptcha"])
+    )
+    Nominatim.reverse = fake_reverse(latency["nominatim"])
+
+    import httpx
+    from config import http_client
+
+    transport = mock_transport(latency, make_jpeg(seed=seed))
+    http_client._new_client = lambda: httpx.AsyncClient(
+        transport=transport,
+        headers={"User-Agent": http_client.USER_AGENT},
+        follow_redirects=True,
+    )
+    return latency
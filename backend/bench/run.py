@@ -0,0 +1,355 @@
+"""
+Load test of the main public endpoints against local fakes.
+
+    cd backend
+    python -m bench.run                                    # defaults, writes bench/results/latest.json
+    python -m bench.run --rows 5000 --concurrency 64 --latency sheets=0.8
+    python -m bench.run --save-baseline                    # record bench/baseline.json
+    python -m bench.run --baseline bench/baseline.json     # compare against it
+
+Starts `bench.server` in a subprocess (fake Sheets / imgbb / Nominatim /
+ipapi / reCAPTCHA with the given latencies and sheet size), waits until the
+tutor list is served, then drives each scenario with a fixed number of
+concurrent clients and reports throughput and p50/p95/p99 latency.
+Scenario inputs come from a seeded RNG, so two runs with the same
+arguments send the same requests. Pass --url to drive a server that is
+already running instead.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from bench import fakes
+from bench.server import parse_latency
+
+BACKEND_DIR = os.path.dirname(fakes.BENCH_DIR)
+RESULTS_FILE = os.path.join(fakes.BENCH_DIR, "results", "latest.json")
+BASELINE_FILE = os.path.join(fakes.BENCH_DIR, "baseline.json")
+
+# Results are only comparable when these match
+WORKLOAD_KEYS = ("rows", "jobs", "requests", "warmup", "concurrency", "seed", "latency")
+
+Request = Tuple[str, str, dict]  # method, path, httpx kwargs
+
+
+# ----------------------------
+# Scenarios
+# ----------------------------
+class Context:
+    """Inputs shared by the scenario builders (tutor ids, upload photo, places)."""
+
+    def __init__(self, profile_ids: List[str], seed: int):
+        self.profile_ids = profile_ids
+        self.rng = random.Random(seed)
+        self.places = fakes.load_places()
+        self.photo = fakes.make_jpeg(size=400, seed=seed)
+
+    def profile_id(self) -> str:
+        return self.rng.choice(self.profile_ids)
+
+
+def tutors(ctx: Context, i: int) -> Request:
+    return "GET", "/tutors/", {}
+
+
+def profile(ctx: Context, i: int) -> Request:
+    return "GET", f"/tutors/profile/{ctx.profile_id()}", {}
+
+
+def image(ctx: Context, i: int) -> Request:
+    return "GET", f"/tutors/image/{ctx.profile_id()}", {"headers": {"Accept": "image/webp,image/*"}}
+
+
+def jobs(ctx: Context, i: int) -> Request:
+    return "GET", "/jobs/public", {}
+
+
+def locations(ctx: Context, i: int) -> Request:
+    return "GET", "/locations", {}
+
+
+def register(ctx: Context, i: int) -> Request:
+    # Every 10th registration is far from any gazetteer place, so it falls through to Nominatim
+    if i % 10 == 9:
+        lat, lng = 23.0, 64.0
+    else:
+        place = ctx.rng.choice(ctx.places)
+        lat, lng = place["lat"] + ctx.rng.uniform(-0.05, 0.05), place["lng"] + ctx.rng.uniform(-0.05, 0.05)
+    data = {
+        "recaptcha_token": f"tutor_register:bench-{i}-{ctx.rng.random()}",
+        "name": "Bench Tutor",
+        "id_card": f"99{i:011d}",
+        "qualification": "MSc",
+        "subject": "Physics",
+        "major_subjects": "Mathematics,Chemistry",
+        "experience": "5",
+        "phone": "03001234567",
+        "bio": "Load test registration.",
+        "lat": f"{lat:.5f}",
+        "lng": f"{lng:.5f}",
+    }
+    files = {"image": ("photo.jpg", ctx.photo, "image/jpeg")}
+    return "POST", "/tutors/register", {"data": data, "files": files}
+
+
+SCENARIOS: Dict[str, Callable[[Context, int], Request]] = {
+    "tutors": tutors,
+    "profile": profile,
+    "image": image,
+    "jobs": jobs,
+    "locations": locations,
+    "register": register,
+}
+
+
+# ----------------------------
+# Measurement
+# ----------------------------
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(p / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def summarize(latencies: List[float], statuses: Counter, elapsed: float) -> Dict:
+    values = sorted(latencies)
+    ok = sum(n for status, n in statuses.items() if status.startswith(("2", "304")))
+    return {
+        "requests": len(values),
+        "errors": len(values) - ok,
+        "statuses": dict(sorted(statuses.items())),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": ms(sum(values) / len(values)) if values else 0.0,
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+        "max_ms": ms(values[-1]) if values else 0.0,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: Context,
+    build: Callable[[Context, int], Request],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> Dict:
+    # Warm-up requests (not measured) take the first indexes, so e.g.
+    # registration ID cards never repeat within one server run
+    for i in range(warmup):
+        method, path, kwargs = build(ctx, i)
+        await client.request(method, path, **kwargs)
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    indexes = iter(range(warmup, warmup + requests))
+
+    async def worker():
+        for i in indexes:
+            method, path, kwargs = build(ctx, i)
+            started = time.perf_counter()
+            try:
+                status = str((await client.request(method, path, **kwargs)).status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+# ----------------------------
+# Server
+# ----------------------------
+def start_server(args) -> subprocess.Popen:
+    latency = ",".join(f"{k}={v}" for k, v in args.latency.items())
+    cmd = [
+        sys.executable, "-m", "bench.server",
+        "--rows", str(args.rows),
+        "--jobs", str(args.jobs),
+        "--seed", str(args.seed),
+        "--port", str(args.port),
+    ]
+    if latency:
+        cmd += ["--latency", latency]
+    return subprocess.Popen(cmd, cwd=BACKEND_DIR)
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float, process: Optional[subprocess.Popen]) -> float:
+    """Seconds until `/tutors/` serves a non-empty list."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"bench server exited with code {process.returncode}")
+        try:
+            r = await client.get("/tutors/")
+            if r.status_code == 200 and r.json():
+                return time.perf_counter() - started
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.1)
+    raise TimeoutError(f"server not ready after {timeout}s")
+
+
+# ----------------------------
+# Report
+# ----------------------------
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def print_report(result: Dict, baseline: Optional[Dict] = None) -> None:
+    base = (baseline or {}).get("scenarios", {})
+    print(f"\n{'scenario':<10} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, s in result["scenarios"].items():
+        print(
+            f"{name:<10} {s['throughput_rps']:>9.1f} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} "
+            f"{s['p99_ms']:>9.1f} {s['errors']:>7}"
+        )
+        b = base.get(name)
+        if b:
+            def delta(key):
+                return f"{(s[key] - b[key]) / b[key] * 100:+8.1f}%" if b[key] else f"{'n/a':>9}"
+            print(f"{'  vs base':<10} {delta('throughput_rps')} {delta('p50_ms')} {delta('p95_ms')} {delta('p99_ms')}")
+    if "startup_seconds" in result:
+        line = f"\nstartup: {result['startup_seconds']:.2f}s"
+        if baseline and baseline.get("startup_seconds"):
+            line += f" (baseline {baseline['startup_seconds']:.2f}s)"
+        print(line)
+
+
+def write_json(path: str, data: Dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+# ----------------------------
+# Main
+# ----------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=1000, help="tutor rows in the fake sheet")
+    parser.add_argument("--jobs", type=int, default=200, help="job rows in the fake sheet")
+    parser.add_argument("--latency", type=parse_latency, default={}, help="per-service seconds, e.g. sheets=0.5,imgbb=1")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="drive an already running server instead of starting one")
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--out", default=RESULTS_FILE)
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write the result to {BASELINE_FILE}")
+    return parser
+
+
+async def bench(args) -> Dict:
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"unknown scenario(s): {', '.join(unknown)}")
+
+    process = None if args.url else start_server(args)
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            startup = await wait_until_ready(client, args.startup_timeout, process)
+            profile_ids = [t["Profile ID"] for t in (await client.get("/tutors/")).json()]
+            ctx = Context(profile_ids, args.seed)
+
+            scenarios = {}
+            for name in names:
+                print(f"▶️  {name}: {args.requests} requests, concurrency {args.concurrency}")
+                scenarios[name] = await run_scenario(
+                    client, ctx, SCENARIOS[name], args.requests, args.concurrency, args.warmup
+                )
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    result = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": args.rows,
+            "jobs": args.jobs,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "latency": {**fakes.DEFAULT_LATENCY, **args.latency},
+            "url": args.url or "",
+        },
+        "scenarios": scenarios,
+    }
+    if process is not None:
+        # Only meaningful for a server this run started itself
+        result["startup_seconds"] = round(startup, 3)
+    return result
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    result = asyncio.run(bench(args))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        differs = [k for k in WORKLOAD_KEYS if baseline.get("meta", {}).get(k) != result["meta"][k]]
+        if differs:
+            print(f"⚠️ Baseline used a different workload ({', '.join(differs)}); deltas are not comparable")
+
+    print_report(result, baseline)
+    write_json(args.out, result)
+    print(f"\n📄 Results written to {args.out}")
+    if args.save_baseline:
+        write_json(BASELINE_FILE, result)
+        print(f"📌 Baseline written to {BASELINE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Run the API against the local fakes (see bench/fakes.py).
+
+    cd backend
+    python -m bench.server --rows 2000 --latency sheets=0.5,imgbb=1.0 --port 8765
+
+`bench.run` starts this in a subprocess, so the load generator and the
+app under test never share an interpreter (or a GIL).
+"""
+import argparse
+
+from bench import fakes
+
+
+def parse_latency(value: str):
+    """'sheets=0.5,imgbb=1' -> {"sheets": 0.5, "imgbb": 1.0}"""
+    latency = {}
+    for part in filter(None, (p.strip() for p in (value or "").split(","))):
+        name, _, seconds = part.partition("=")
+        if name not in fakes.DEFAULT_LATENCY:
+            raise argparse.ArgumentTypeError(
+                f"unknown service '{name}' (one of {', '.join(fakes.DEFAULT_LATENCY)})"
+            )
+        latency[name] = float(seconds)
+    return latency
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="tutor rows in the fake sheet")
+    parser.add_argument("--jobs", type=int, default=200, help="job rows in the fake sheet")
+    parser.add_argument("--latency", type=parse_latency, default={}, help="per-service seconds, e.g. sheets=0.5,imgbb=1")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    latency = fakes.install(rows=args.rows, jobs=args.jobs, latency=args.latency, seed=args.seed)
+    print(f"🧪 Fake services: {latency}")
+
+    import uvicorn
+    from main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
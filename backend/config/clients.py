@@ -0,0 +1,95 @@
+"""
+Process-wide clients for Google services, created on first use.
+
+Nothing here talks to the network at import time: `clients.get("gspread")`
+authorizes once, `clients.get("spreadsheet")` opens the spreadsheet once,
+and every module shares those instances. Startup warms them in the
+background (see utils/warmup.py) instead of blocking the import.
+"""
+import threading
+from typing import Any, Callable, Dict
+
+import gspread
+from google.oauth2.service_account import Credentials
+
+from config.settings import SERVICE_ACCOUNT_JSON, RECAPTCHA_SA_JSON, SCOPES, SHEET_ID
+
+
+class ClientRegistry:
+    """
+    Named factories whose results are built once and then shared. Concurrent
+    first calls wait for a single build; a failed build is not remembered,
+    so the next call tries again.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._locks[name]:
+            if name not in self._instances:
+                self._instances[name] = self._factories[name]()
+            return self._instances[name]
+
+    def reset(self, name: str) -> None:
+        """Drop a client (e.g. after its credentials were rotated); rebuilt on next use."""
+        with self._locks[name]:
+            self._instances.pop(name, None)
+
+    def status(self) -> Dict[str, bool]:
+        return {name: name in self._instances for name in self._factories}
+
+
+# ----------------------------
+# Factories
+# ----------------------------
+def _gspread():
+    creds = Credentials.from_service_account_info(SERVICE_ACCOUNT_JSON, scopes=SCOPES)
+    client = gspread.authorize(creds)
+    print("✅ Google Sheets client authorized successfully")
+    return client
+
+
+def _spreadsheet():
+    try:
+        spreadsheet = clients.get("gspread").open_by_key(SHEET_ID)
+    except gspread.SpreadsheetNotFound:
+        print(f"❌ Spreadsheet with ID {SHEET_ID} NOT found or access denied")
+        raise
+    print("✅ Successfully opened spreadsheet")
+    return spreadsheet
+
+
+def _recaptcha():
+    # The gRPC stack is slow to import; only pay for it when first needed
+    from google.cloud import recaptchaenterprise_v1
+
+    return recaptchaenterprise_v1.RecaptchaEnterpriseServiceClient.from_service_account_info(
+        RECAPTCHA_SA_JSON
+    )
+
+
+clients = ClientRegistry()
+clients.register("gspread", _gspread)
+clients.register("spreadsheet", _spreadsheet)
+clients.register("recaptcha", _recaptcha)
+
+
+def open_worksheet(title: str):
+    """One worksheet of the shared spreadsheet (SheetsRepository's opener)."""
+    try:
+        worksheet = clients.get("spreadsheet").worksheet(title)
+    except gspread.WorksheetNotFound:
+        print(f"❌ Worksheet '{title}' NOT found in spreadsheet. Check exact name and capitalization")
+        raise
+    print(f"✅ Successfully opened {title} worksheet")
+    return worksheet
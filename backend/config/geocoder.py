@@ -1,2 +1,115 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from geopy.extra.rate_limiter import RateLimiter
 from geopy.geocoders import Nominatim
+
+from config.locations import pakistan_data
+from config.settings import (
+    GEOCODE_CACHE_SIZE,
+    GEOCODE_LOCAL_MAX_KM,
+    GEOCODE_TEHSIL_MAX_KM,
+    NOMINATIM_MIN_DELAY_SECONDS,
+)
+from utils.cache import LRUCache
+from utils.gazetteer import Gazetteer
+from utils.metrics import span, watch_cache
+
+logger = logging.getLogger("geocoder")
+
 geolocator = Nominatim(user_agent="APlusAcademy/1.0")
+# Public Nominatim allows ~1 request/second; calls queue up behind this
+nominatim_reverse = RateLimiter(
+    geolocator.reverse,
+    min_delay_seconds=NOMINATIM_MIN_DELAY_SECONDS,
+    max_retries=1,
+    swallow_exceptions=False,
+)
+
+GAZETTEER_FILE = os.path.join(os.path.dirname(__file__), "..", "gazetteer.json")
+gazetteer = Gazetteer.from_file(GAZETTEER_FILE, pakistan_data)
+
+EMPTY_LOCATION = {"city": "", "district": "", "province": "", "tehsil": ""}
+
+# Keyed on coordinates rounded to 3 decimals (~100 m)
+geocode_cache = LRUCache(max_entries=GEOCODE_CACHE_SIZE)
+watch_cache("geocode", geocode_cache.stats)
+
+
+def _cache_key(lat: float, lng: float):
+    return round(float(lat), 3), round(float(lng), 3)
+
+
+def lookup_local(lat: float, lng: float) -> Optional[dict]:
+    """
+    Cached or gazetteer answer for the coordinates, without any network call.
+    Province and district come from the nearest place within
+    GEOCODE_LOCAL_MAX_KM; city and tehsil only when it is within
+    GEOCODE_TEHSIL_MAX_KM. Returns None on a miss.
+    """
+    key = _cache_key(lat, lng)
+    cached = geocode_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    hit = gazetteer.nearest(key[0], key[1], GEOCODE_LOCAL_MAX_KM)
+    if hit is None:
+        return None
+    distance, place = hit
+    close = distance <= GEOCODE_TEHSIL_MAX_KM
+    location = {
+        "city": place.get("city", "") if close else "",
+        "district": place["district"],
+        "province": place["province"],
+        "tehsil": place.get("tehsil", "") if close else "",
+    }
+    geocode_cache.set(key, location)
+    return dict(location)
+
+
+def lookup_nominatim(lat: float, lng: float) -> dict:
+    """Rate-limited Nominatim lookup; successful answers are cached."""
+    with span("nominatim"):
+        loc = nominatim_reverse(f"{lat}, {lng}", timeout=10)
+    addr = loc.raw.get("address", {}) if loc else {}
+    location = {
+        "city": addr.get("city") or addr.get("town") or "",
+        "district": addr.get("county") or "",
+        "province": addr.get("state") or "",
+        "tehsil": addr.get("suburb") or "",
+    }
+    if any(location.values()):
+        geocode_cache.set(_cache_key(lat, lng), location)
+    return location
+
+
+def reverse_geocode(lat: float, lng: float) -> dict:
+    """
+    Resolve coordinates to city / district / province / tehsil: cache,
+    then the local gazetteer, then Nominatim. Returns blanks when every
+    lookup fails.
+    """
+    try:
+        location = lookup_local(lat, lng)
+        if location is not None:
+            return location
+        return lookup_nominatim(lat, lng)
+    except Exception as e:
+        logger.error(f"⚠️ Reverse geocode of ({lat}, {lng}) failed: {e}")
+        return dict(EMPTY_LOCATION)
+
+
+async def reverse_geocode_async(lat: float, lng: float) -> dict:
+    """
+    `reverse_geocode` for the event loop: local answers are returned inline,
+    only a Nominatim fallback goes to a worker thread.
+    """
+    try:
+        location = lookup_local(lat, lng)
+    except (TypeError, ValueError):
+        return dict(EMPTY_LOCATION)
+    if location is not None:
+        return location
+    return await asyncio.to_thread(reverse_geocode, lat, lng)
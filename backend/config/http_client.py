@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config.settings import (
+    HTTP_TIMEOUT_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_RETRIES,
+)
+
+logger = logging.getLogger("config.http_client")
+
+USER_AGENT = "TheProfessorAcademy/1.0"
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Failures before the request was sent; safe to retry even for a POST
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# ----------------------------
+# Application-scoped client
+# ----------------------------
+_client: Optional[httpx.AsyncClient] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_host_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=min(5.0, HTTP_TIMEOUT_SECONDS)),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS // 2,
+        ),
+        headers={"User-Agent": USER_AGENT},
+        follow_redirects=True,
+    )
+
+
+async def start_http_client() -> None:
+    """Create the shared client on the app's event loop (startup)."""
+    global _client, _loop
+    if _client is None:
+        _client = _new_client()
+        _loop = asyncio.get_running_loop()
+        logger.info("✅ Shared HTTP client started")
+
+
+async def close_http_client() -> None:
+    """Close pooled connections (shutdown)."""
+    global _client, _loop
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _loop = None
+        _host_limits.clear()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    if _client is None:
+        raise RuntimeError("HTTP client not started; call start_http_client() on startup")
+    return _client
+
+
+# ----------------------------
+# Requests
+# ----------------------------
+async def request(
+    method: str,
+    url: str,
+    retries: Optional[int] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send a request through the shared pool.
+
+    At most HTTP_MAX_CONNECTIONS_PER_HOST requests run against one host at a
+    time. Idempotent methods retry transport errors and 429/5xx responses
+    with exponential backoff. Other methods (e.g. the imgbb upload POST)
+    only retry when the connection could not be made, since the server may
+    already have acted on a request that failed later.
+    """
+    client = client or get_http_client()
+    method = method.upper()
+    retries = HTTP_RETRIES if retries is None else retries
+    host = urlsplit(url).netloc
+    limit = _host_limits.setdefault(host, asyncio.Semaphore(HTTP_MAX_CONNECTIONS_PER_HOST))
+
+    for attempt in range(retries + 1):
+        try:
+            async with limit:
+                response = await client.request(method, url, **kwargs)
+            if (
+                response.status_code in RETRY_STATUSES
+                and method in IDEMPOTENT_METHODS
+                and attempt < retries
+            ):
+                logger.warning(f"⚠️ {method} {host} returned {response.status_code}, retrying")
+            else:
+                return response
+        except httpx.TransportError as e:
+            if attempt >= retries or (method not in IDEMPOTENT_METHODS and not isinstance(e, CONNECT_ERRORS)):
+                raise
+            logger.warning(f"⚠️ {method} {host} failed ({e!r}), retrying")
+        await asyncio.sleep(0.25 * 2 ** attempt)
+    return response
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs) -> httpx.Response:
+    return await request("POST", url, **kwargs)
+
+
+# ----------------------------
+# Bridge for worker threads
+# ----------------------------
+async def _fetch_bytes(url: str, client: Optional[httpx.AsyncClient] = None) -> bytes:
+    response = await get(url, client=client)
+    response.raise_for_status()
+    return response.content
+
+
+async def _fetch_bytes_once(url: str) -> bytes:
+    async with _new_client() as client:
+        return await _fetch_bytes(url, client=client)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def fetch_bytes_sync(url: str, timeout: Optional[float] = None) -> bytes:
+    """
+    GET `url` from a worker thread (sync routes, thumbnail pool) using the
+    shared pool on the app's event loop. Outside the app (scripts, no
+    loop running) a short-lived client is used instead.
+    """
+    loop = _loop
+    if loop is not None and loop.is_running():
+        if _running_loop() is loop:
+            raise RuntimeError("fetch_bytes_sync() called on the event loop thread")
+        future = asyncio.run_coroutine_threadsafe(_fetch_bytes(url), loop)
+        return future.result(timeout or HTTP_TIMEOUT_SECONDS * (HTTP_RETRIES + 2))
+    return asyncio.run(_fetch_bytes_once(url))
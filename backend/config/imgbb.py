@@ -1,17 +1,25 @@
 import base64
-import requests
+from config import http_client
 from config.settings import IMGBB_API_KEY
+from utils.metrics import span
 
 async def upload_to_imgbb(image):
     if not image or not image.filename:
         return "N/A"
 
-    img_bytes = await image.read()
+    return await upload_image_bytes(await image.read(), image.filename)
+
+
+async def upload_image_bytes(img_bytes: bytes, filename: str):
+    if not img_bytes or not filename:
+        return "N/A"
+
     encoded = base64.b64encode(img_bytes).decode("utf-8")
 
-    payload = {"key": IMGBB_API_KEY, "image": encoded, "name": image.filename}
-    r = requests.post("https://api.imgbb.com/1/upload", data=payload)
-    data = r.json()
+    payload = {"key": IMGBB_API_KEY, "image": encoded, "name": filename}
+    with span("imgbb"):
+        r = await http_client.post("https://api.imgbb.com/1/upload", data=payload, timeout=30)
+        data = r.json()
 
     if data.get("success"):
         raw_url = data["data"]["url"]
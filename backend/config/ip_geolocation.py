@@ -0,0 +1,101 @@
+import asyncio
+import ipaddress
+import logging
+import threading
+from typing import Dict, Optional
+
+from config import http_client
+from config.settings import IP_CACHE_SIZE, IP_CACHE_TTL_SECONDS, IP_DB_PATH
+from utils.cache import LRUCache
+from utils.ip_ranges import IPRangeDB
+from utils.metrics import span, watch_cache
+
+logger = logging.getLogger("config.ip_geolocation")
+
+IPAPI_URL = "https://ipapi.co/{ip}/json/"
+
+# Answers by exact IP and by network prefix (/24 for IPv4, /48 for IPv6):
+# neighbouring addresses almost always resolve to the same city
+ip_cache = LRUCache(max_entries=IP_CACHE_SIZE, ttl=IP_CACHE_TTL_SECONDS)
+ip_db: Optional[IPRangeDB] = None
+_inflight: Dict[str, asyncio.Future] = {}
+watch_cache("ip", ip_cache.stats)
+
+
+def _prefix(addr) -> str:
+    bits = 24 if addr.version == 4 else 48
+    return str(ipaddress.ip_network(f"{addr}/{bits}", strict=False))
+
+
+def load_ip_db(path: str = IP_DB_PATH) -> None:
+    """Load the optional local IP-range CSV (startup, off the event loop)."""
+    global ip_db
+    if not path:
+        return
+    try:
+        ip_db = IPRangeDB.from_csv(path)
+        logger.info(f"✅ Loaded {len(ip_db)} IP ranges from {path}")
+    except Exception as e:
+        logger.error(f"⚠️ IP database {path} could not be loaded: {e}")
+
+
+def start_ip_db_loader() -> None:
+    if IP_DB_PATH:
+        threading.Thread(target=load_ip_db, name="ip-db-loader", daemon=True).start()
+
+
+async def _fetch_remote(ip: str) -> Dict:
+    with span("ipapi"):
+        r = await http_client.get(IPAPI_URL.format(ip=ip), timeout=5)
+        data = r.json()
+        if r.status_code != 200 or data.get("error"):
+            raise RuntimeError(data.get("reason") or f"ipapi.co returned {r.status_code}")
+    return data
+
+
+async def locate_ip(ip: str) -> Dict:
+    """
+    Location for `ip`: exact-IP cache, /24 cache, local IP database, then
+    ipapi.co. Concurrent lookups of one IP share a single remote call.
+    Private, loopback and unparseable addresses resolve to {}; so does a
+    failed remote lookup (not cached, so the next request retries).
+    """
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return {}
+    if not addr.is_global:
+        return {}
+
+    prefix = _prefix(addr)
+    cached = ip_cache.get(ip)
+    if cached is not None:
+        return cached
+    cached = ip_cache.get(prefix)
+    if cached is not None:
+        return {**cached, "ip": ip}
+
+    record = ip_db.lookup(ip) if ip_db is not None else None
+    if record is not None:
+        result = {"ip": ip, **record}
+        ip_cache.set(ip, result)
+        return result
+
+    future = _inflight.get(ip)
+    if future is not None:
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[ip] = future
+    result = {}
+    try:
+        result = await _fetch_remote(ip)
+        ip_cache.set(ip, result)
+        ip_cache.set(prefix, result)
+    except Exception as e:
+        logger.error(f"⚠️ IP lookup for {ip} failed: {e}")
+    finally:
+        # Also on cancellation, so waiters never hang
+        _inflight.pop(ip, None)
+        future.set_result(result)
+    return result
@@ -1,5 +1,21 @@
 import os, json
 
+from utils.location_index import LocationIndex
+from utils.payloads import RenderedJSON
+
 LOCATIONS_FILE = os.path.join(os.path.dirname(__file__), "..", "locations.json")
 with open(LOCATIONS_FILE, "r", encoding="utf-8") as f:
     pakistan_data = json.load(f)
+
+# Serialized and compressed once; served as stored bytes
+locations_payload = RenderedJSON(pakistan_data, best=True)
+
+# Key lists for the drill-down routes
+DISTRICTS = {province: list(districts) for province, districts in pakistan_data.items()}
+TEHSILS = {
+    (province, district): list(tehsils)
+    for province, districts in pakistan_data.items()
+    for district, tehsils in districts.items()
+}
+
+location_index = LocationIndex(pakistan_data)
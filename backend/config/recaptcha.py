@@ -1,54 +1,141 @@
-from google.cloud import recaptchaenterprise_v1
+import asyncio
+import hashlib
+import logging
 from fastapi import HTTPException, Request
+from config.clients import clients
 from config.settings import (
-    RECAPTCHA_SA_JSON,
     RECAPTCHA_PROJECT_ID,
-    RECAPTCHA_SITE_KEY
+    RECAPTCHA_SITE_KEY,
+    RECAPTCHA_TIMEOUT_SECONDS,
+    RECAPTCHA_TOKEN_TTL_SECONDS,
+    RECAPTCHA_FAIL_OPEN,
+    RECAPTCHA_BREAKER_FAILURES,
+    RECAPTCHA_BREAKER_RESET_SECONDS,
 )
+from utils.cache import LRUCache
+from utils.circuit_breaker import CircuitBreaker
+from utils.metrics import span, watch_cache
 
-# Create Recaptcha Client
-recaptcha_client = recaptchaenterprise_v1.RecaptchaEnterpriseServiceClient.from_service_account_info(
-    RECAPTCHA_SA_JSON
+logger = logging.getLogger("config.recaptcha")
+
+# Tokens already submitted (hashed); a second use is rejected locally
+seen_tokens = LRUCache(max_entries=100_000, ttl=RECAPTCHA_TOKEN_TTL_SECONDS)
+recaptcha_breaker = CircuitBreaker(
+    "recaptcha",
+    failure_threshold=RECAPTCHA_BREAKER_FAILURES,
+    reset_timeout=RECAPTCHA_BREAKER_RESET_SECONDS,
 )
+watch_cache("recaptcha_tokens", seen_tokens.stats)
 
 
-def verify_recaptcha(token: str, expected_action: str, request: Request):
-    try:
-        event = recaptchaenterprise_v1.Event(
-            token=token,
-            site_key=RECAPTCHA_SITE_KEY,
-            user_ip_address=request.client.host  # improves score reliability
-        )
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else ""
 
-        assessment = recaptchaenterprise_v1.Assessment(
-            event=event
-        )
 
-        request_obj = recaptchaenterprise_v1.CreateAssessmentRequest(
-            parent=f"projects/{RECAPTCHA_PROJECT_ID}",
-            assessment=assessment
-        )
+def _assess(token: str, user_ip: str):
+    """One create_assessment call, bounded by RECAPTCHA_TIMEOUT_SECONDS."""
+    # Imported here, like the client (config/clients.py): the gRPC stack is slow to load
+    from google.cloud import recaptchaenterprise_v1
+
+    recaptcha_client = clients.get("recaptcha")
+    event = recaptchaenterprise_v1.Event(
+        token=token,
+        site_key=RECAPTCHA_SITE_KEY,
+        user_ip_address=user_ip  # improves score reliability
+    )
+
+    assessment = recaptchaenterprise_v1.Assessment(
+        event=event
+    )
+
+    request_obj = recaptchaenterprise_v1.CreateAssessmentRequest(
+        parent=f"projects/{RECAPTCHA_PROJECT_ID}",
+        assessment=assessment
+    )
+
+    with span("recaptcha"):
+        return recaptcha_client.create_assessment(request=request_obj, timeout=RECAPTCHA_TIMEOUT_SECONDS)
+
+
+def _check(response, expected_action: str) -> bool:
+    props = response.token_properties
+
+    # Validate Token
+    if not props.valid:
+        raise HTTPException(status_code=400, detail="Invalid reCAPTCHA token")
+
+    # Validate Correct Action
+    if props.action != expected_action:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid reCAPTCHA action: {props.action}")
 
-        response = recaptcha_client.create_assessment(request=request_obj)
-        props = response.token_properties
+    # Risk Score Check (adjust if needed)
+    if response.risk_analysis.score < 0.5:
+        raise HTTPException(status_code=400, detail="Bot detected")
 
-        # Validate Token
-        if not props.valid:
-            raise HTTPException(status_code=400, detail="Invalid reCAPTCHA token")
+    return True
 
-        # Validate Correct Action
-        if props.action != expected_action:
-            raise HTTPException(status_code=400,
-                                detail=f"Invalid reCAPTCHA action: {props.action}")
 
-        # Risk Score Check (adjust if needed)
-        if response.risk_analysis.score < 0.5:
-            raise HTTPException(status_code=400, detail="Bot detected")
+def _transient_errors() -> tuple:
+    """Errors meaning Google did not answer in time (as opposed to a bad token or credentials)."""
+    from google.api_core import exceptions as api_exceptions
 
+    return (asyncio.TimeoutError, api_exceptions.DeadlineExceeded, api_exceptions.ServiceUnavailable)
+
+
+def _unavailable(reason: str) -> bool:
+    """Google could not be asked: let the request through or reject it."""
+    if RECAPTCHA_FAIL_OPEN:
+        logger.warning(f"⚠️ reCAPTCHA skipped (fail-open): {reason}")
         return True
+    raise HTTPException(status_code=503, detail="reCAPTCHA verification is temporarily unavailable")
 
+
+def verify_recaptcha(token: str, expected_action: str, request: Request):
+    try:
+        return _check(_assess(token, _client_ip(request)), expected_action)
     except HTTPException:
         raise
     except Exception as e:
         print("reCAPTCHA error:", e)
         raise HTTPException(status_code=400, detail="reCAPTCHA validation failed")
+
+
+async def verify_recaptcha_async(token: str, expected_action: str, request: Request) -> bool:
+    """
+    Non-blocking `verify_recaptcha`: the assessment runs on a worker thread
+    under a deadline. Reused tokens are rejected without a remote call, and
+    while the circuit breaker is open (or on a timeout / unavailable API)
+    the request fails open or closed per RECAPTCHA_FAIL_OPEN. Any other
+    error (malformed token, bad credentials) is a 400, like the sync path.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    if key in seen_tokens:
+        raise HTTPException(status_code=400, detail="reCAPTCHA token already used")
+
+    # Checked before the token is marked used, so a 503 here leaves it retryable
+    if not recaptcha_breaker.allow():
+        accepted = _unavailable("circuit open")  # raises unless failing open
+        seen_tokens.set(key, True)
+        return accepted
+    seen_tokens.set(key, True)
+
+    try:
+        response = await asyncio.wait_for(
+            asyncio.to_thread(_assess, token, _client_ip(request)),
+            timeout=RECAPTCHA_TIMEOUT_SECONDS + 1,
+        )
+    except Exception as e:
+        if not isinstance(e, _transient_errors()):
+            # Google answered (or was never reachable with this config): no retry, no fail-open
+            recaptcha_breaker.record_success()
+            logger.error(f"⚠️ reCAPTCHA assessment rejected: {e!r}")
+            raise HTTPException(status_code=400, detail="reCAPTCHA validation failed")
+        recaptcha_breaker.record_failure()
+        # Not the client's fault: let the same token be retried
+        seen_tokens.pop(key)
+        logger.error(f"⚠️ reCAPTCHA assessment failed: {e!r}")
+        return _unavailable(repr(e))
+
+    recaptcha_breaker.record_success()
+    return _check(response, expected_action)
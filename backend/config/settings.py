@@ -17,3 +17,65 @@ IMGBB_API_KEY = os.environ.get("IMGBB_API_KEY", "")
 
 RECAPTCHA_PROJECT_ID = os.environ["GCLOUD_PROJECT_ID"]
 RECAPTCHA_SITE_KEY = os.environ["RECAPTCHA_SITE_KEY_TPA"]
+RECAPTCHA_TIMEOUT_SECONDS = float(os.environ.get("RECAPTCHA_TIMEOUT_SECONDS", "5"))
+# Tokens are single-use and expire after 2 minutes; remember them that long
+RECAPTCHA_TOKEN_TTL_SECONDS = int(os.environ.get("RECAPTCHA_TOKEN_TTL_SECONDS", "120"))
+# While Google is unreachable: "1" lets registrations through, "0" rejects them
+RECAPTCHA_FAIL_OPEN = os.environ.get("RECAPTCHA_FAIL_OPEN", "0") == "1"
+RECAPTCHA_BREAKER_FAILURES = int(os.environ.get("RECAPTCHA_BREAKER_FAILURES", "5"))
+RECAPTCHA_BREAKER_RESET_SECONDS = float(os.environ.get("RECAPTCHA_BREAKER_RESET_SECONDS", "60"))
+
+# Storage: "sqlite" (local mirror, synced from Sheets) or "sheets" (direct)
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "sqlite").lower()
+SQLITE_PATH = os.environ.get(
+    "SQLITE_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "academy.db")
+)
+SYNC_INTERVAL_SECONDS = int(os.environ.get("SYNC_INTERVAL_SECONDS", "300"))
+# Incremental sync: appended rows + a rotating window of existing rows per pass,
+# with a full reload every SYNC_FULL_EVERY passes
+SYNC_INCREMENTAL = os.environ.get("SYNC_INCREMENTAL", "1") != "0"
+SYNC_VERIFY_WINDOW = int(os.environ.get("SYNC_VERIFY_WINDOW", "200"))
+SYNC_FULL_EVERY = int(os.environ.get("SYNC_FULL_EVERY", "12"))
+
+# Thumbnails: in-memory LRU budget + on-disk second tier
+THUMBNAIL_CACHE_MAX_BYTES = int(os.environ.get("THUMBNAIL_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+THUMBNAIL_CACHE_DIR = os.environ.get(
+    "THUMBNAIL_CACHE_DIR", os.path.join(os.path.dirname(__file__), "..", "data", "thumbnails")
+)
+THUMBNAIL_DISK_MAX_BYTES = int(os.environ.get("THUMBNAIL_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+THUMBNAIL_WARM_WORKERS = int(os.environ.get("THUMBNAIL_WARM_WORKERS", "4"))
+
+# Shared outbound HTTP client
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", "10"))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "2"))
+
+# Background registration pipeline
+REGISTRATION_WORKERS = int(os.environ.get("REGISTRATION_WORKERS", "4"))
+REGISTRATION_QUEUE_SIZE = int(os.environ.get("REGISTRATION_QUEUE_SIZE", "1000"))
+
+# Reverse geocoding: local gazetteer first, rate-limited Nominatim on a miss
+GEOCODE_CACHE_SIZE = int(os.environ.get("GEOCODE_CACHE_SIZE", "4096"))
+GEOCODE_LOCAL_MAX_KM = float(os.environ.get("GEOCODE_LOCAL_MAX_KM", "40"))
+GEOCODE_TEHSIL_MAX_KM = float(os.environ.get("GEOCODE_TEHSIL_MAX_KM", "8"))
+NOMINATIM_MIN_DELAY_SECONDS = float(os.environ.get("NOMINATIM_MIN_DELAY_SECONDS", "1"))
+
+# IP geolocation: TTL LRU (per IP and per /24) in front of ipapi.co, plus an
+# optional local IP2Location-LITE-style CSV (ip_from,ip_to,country_code,
+# country_name,region,city,latitude,longitude; .csv or .csv.gz)
+IP_CACHE_SIZE = int(os.environ.get("IP_CACHE_SIZE", "10000"))
+IP_CACHE_TTL_SECONDS = int(os.environ.get("IP_CACHE_TTL_SECONDS", str(24 * 3600)))
+IP_DB_PATH = os.environ.get("IP_DB_PATH", "")
+
+# Write-behind journal for appended sheet rows
+JOURNAL_PATH = os.environ.get(
+    "JOURNAL_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "journal.db")
+)
+WRITE_BATCH_SIZE = int(os.environ.get("WRITE_BATCH_SIZE", "50"))
+WRITE_FLUSH_SECONDS = float(os.environ.get("WRITE_FLUSH_SECONDS", "5"))
+
+# Logging / instrumentation
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# One line per sheet row while loading tutors; only useful when debugging a sheet
+DEBUG_ROW_LOGS = os.environ.get("DEBUG_ROW_LOGS", "0") == "1"
@@ -1,40 +1,63 @@
-import gspread
-from datetime import datetime, timedelta
-from google.oauth2.service_account import Credentials
-from config.settings import SERVICE_ACCOUNT_JSON, SCOPES, SHEET_ID
+from datetime import timedelta
+from typing import Dict, List, NamedTuple
+from config.clients import open_worksheet
+from config.settings import (
+    STORAGE_BACKEND,
+    SQLITE_PATH,
+    SYNC_INTERVAL_SECONDS,
+    SYNC_INCREMENTAL,
+    SYNC_VERIFY_WINDOW,
+    SYNC_FULL_EVERY,
+    DEBUG_ROW_LOGS,
+    JOURNAL_PATH,
+    WRITE_BATCH_SIZE,
+    WRITE_FLUSH_SECONDS,
+)
+from storage import (
+    TUTORS,
+    JOBS,
+    SheetsRepository,
+    SQLiteRepository,
+    SheetSync,
+    WriteBehindRepository,
+)
+from utils.cache import BackgroundRefresher
+from utils.metrics import watch_gauge
+from models.tutor import Tutor
+from utils.snapshot import TutorSnapshot, EMPTY_SNAPSHOT
 
 # ----------------------------
-# Google Sheets client
+# Repository (what the app reads from)
 # ----------------------------
-try:
-    creds = Credentials.from_service_account_info(SERVICE_ACCOUNT_JSON, scopes=SCOPES)
-    gspread_client = gspread.authorize(creds)
-    print("✅ Google Sheets client authorized successfully")
-except Exception as e:
-    print("❌ Failed to authorize Google Sheets client:", e)
-    raise
+# Worksheets open on first use (see config/clients.py); nothing here waits on Google
+sheets_repository = SheetsRepository(opener=open_worksheet)
+
+# Appends are journaled locally and flushed to Sheets in batches
+write_behind = WriteBehindRepository(
+    sheets_repository,
+    JOURNAL_PATH,
+    batch_size=WRITE_BATCH_SIZE,
+    flush_interval=WRITE_FLUSH_SECONDS,
+)
+
+if STORAGE_BACKEND == "sheets":
+    repository = write_behind
+    sync = None
+else:
+    repository = SQLiteRepository(SQLITE_PATH, upstream=write_behind)
+    sync = SheetSync(
+        repository,
+        sheets_repository,
+        sheets=(TUTORS, JOBS),
+        interval=SYNC_INTERVAL_SECONDS,
+        incremental=SYNC_INCREMENTAL,
+        verify_window=SYNC_VERIFY_WINDOW,
+        full_every=SYNC_FULL_EVERY,
+    )
 
 # ----------------------------
-# Connect to the Tutors sheet
+# Cache settings
 # ----------------------------
-try:
-    sheet = gspread_client.open_by_key(SHEET_ID).worksheet("Tutors")
-    print("✅ Successfully opened Tutors worksheet")
-except gspread.SpreadsheetNotFound:
-    print(f"❌ Spreadsheet with ID {SHEET_ID} NOT found or access denied")
-    raise
-except gspread.WorksheetNotFound:
-    print("❌ Worksheet 'Tutors' NOT found in spreadsheet. Check exact name and capitalization")
-    raise
-except Exception as e:
-    print("❌ Unknown error while opening sheet:", e)
-    raise
-
-# ----------------------------
-# Cache globals
-# ----------------------------
-cached_tutors = []
-last_fetch_time = datetime.min
 CACHE_DURATION = timedelta(minutes=5)
 
 # ----------------------------
@@ -45,17 +68,19 @@ def s(v):
     return str(v).strip() if v else ""
 
 # ----------------------------
-# Preload tutors
+# Load tutors
 # ----------------------------
-def preload_tutors():
+def load_tutors(records=None):
     """
-    Load all verified tutors from Google Sheets into cache.
-    Handles subjects and major subjects, sets cached_tutors.
+    Load all verified tutors from the repository (or the given records)
+    as parsed Tutor records; returns the new tutor list.
+    Raises on failure so the cache keeps serving the last good list.
     """
-    global cached_tutors, last_fetch_time
-
     try:
-        records = sheet.get_all_records(empty2zero=False, head=1)
+        if records is None:
+            records = repository.get_records(TUTORS)
+        if not records:
+            raise Exception("Tutors sheet returned no rows.")
         print(f"📌 TOTAL ROWS LOADED FROM SHEET: {len(records)}")
 
         verified = []
@@ -63,81 +88,114 @@ def preload_tutors():
         for idx, r in enumerate(records):
             raw_verified = r.get("Verified", None)
             cleaned = s(raw_verified).lower()
-            print(f"Row {idx} Verified raw value: {repr(raw_verified)} | cleaned: {repr(cleaned)}")
+            if DEBUG_ROW_LOGS:
+                print(f"Row {idx} Verified raw value: {repr(raw_verified)} | cleaned: {repr(cleaned)}")
 
             # Skip unverified tutors
             if not cleaned.startswith("y"):
-                print(f"❌ Row {idx} skipped — NOT verified")
+                if DEBUG_ROW_LOGS:
+                    print(f"❌ Row {idx} skipped — NOT verified")
                 continue
 
-            # Primary subject
-            primary_subject = s(r.get("Subject"))
-            
-            # Major subjects, deduplicated, excluding primary
-            major_subjects_raw = r.get("Major Subjects", "")
-            major_subjects_list = []
-            if major_subjects_raw:
-                major_subjects_list = [x.strip() for x in str(major_subjects_raw).split(",") if x.strip()]
-                if primary_subject in major_subjects_list:
-                    major_subjects_list.remove(primary_subject)
-
-            # Construct tutor dict
-            tutor = {
-                "Profile ID": s(r.get("Profile ID")),
-                "Profile URL": s(r.get("Profile URL")),
-                "Name": s(r.get("Full Name")),
-                "ID Card Number": s(r.get("ID Card Number")),
-                "Qualification": s(r.get("Qualification")),
-                "Subject": primary_subject,
-                "Major Subjects": ",".join(major_subjects_list),
-                "Experience": s(r.get("Experience")),
-                "Phone": s(r.get("Phone")),
-                "Bio": s(r.get("Bio")),
-                "Province": s(r.get("Province")),
-                "District": s(r.get("District")),
-                "Tehsil": s(r.get("Tehsil")),
-                "City": s(r.get("City")),
-                "Latitude": s(r.get("Latitude")),
-                "Longitude": s(r.get("Longitude")),
-                "Image URL": s(r.get("Image URL")),
-                "Verified": cleaned.startswith("y"),
-            }
-
+            tutor = Tutor.from_record(r)
             verified.append(tutor)
-            print(f"✅ Row {idx} accepted: {tutor['Name']}")
-
-        if not verified:
-            raise Exception("No verified tutors found in the sheet.")
+            if DEBUG_ROW_LOGS:
+                print(f"✅ Row {idx} accepted: {tutor.name}")
 
-        cached_tutors = verified
-        last_fetch_time = datetime.utcnow()
-        print(f"🔥 FINAL VERIFIED COUNT: {len(cached_tutors)}")
+        print(f"🔥 FINAL VERIFIED COUNT: {len(verified)}")
+        return verified
 
     except Exception as e:
-        cached_tutors = []
-        last_fetch_time = datetime.min
         print("⚠️ Preload failed:", e)
         raise Exception(f"Failed to load tutors from sheet: {e}")
+
+
+def load_tutor_snapshot() -> TutorSnapshot:
+    """
+    Read the Tutors sheet once and build the public list, its lookup
+    indexes and the admin view (all rows) as one snapshot.
+    """
+    records = repository.get_records(TUTORS)
+    return TutorSnapshot(load_tutors(records), records=records)
+
+
+# ----------------------------
+# Tutor cache (stale-while-revalidate)
+# ----------------------------
+tutor_cache = BackgroundRefresher("tutors", load_tutor_snapshot, CACHE_DURATION)
+watch_gauge(
+    "tutor_snapshot_age_seconds",
+    "Seconds since the tutor snapshot was last rebuilt.",
+    lambda: tutor_cache.age() or 0,
+)
+
+if sync is not None:
+    # Rebuild the snapshot as soon as fresh sheet data lands locally
+    sync.on_synced.append(lambda counts: TUTORS in counts and tutor_cache.trigger(force=True))
+
+
+def preload_tutors():
+    """
+    Synchronously load tutors into the cache (used at startup).
+    On failure the previous snapshot, if any, stays in place.
+    """
+    if not tutor_cache.refresh():
+        raise Exception(f"Failed to load tutors: {tutor_cache.last_error}")
+
+
+def get_snapshot() -> TutorSnapshot:
+    """Last good tutor snapshot (never blocks on a reload)."""
+    return tutor_cache.get() or EMPTY_SNAPSHOT
+
 # ----------------------------
 # Check if ID card already exists
 # ----------------------------
 def is_id_registered(id_card: str) -> bool:
     """
-    Check if a tutor with this 13-digit ID exists in cached tutors.
+    Check if a tutor with this 13-digit ID is already on file: a verified
+    tutor in the snapshot, or any row of the Tutors sheet, including
+    unverified ones and registrations still waiting to be flushed.
+    A local lookup with the SQLite store; with STORAGE_BACKEND=sheets it
+    reads the ID card column, so call it off the event loop.
     """
-    return any(t["ID Card Number"] == id_card for t in cached_tutors)
+    return get_snapshot().has_id_card(id_card) or repository.id_card_exists(TUTORS, id_card)
 
 # ----------------------------
 # Load Jobs Sheet
 # ----------------------------
 def load_jobs_sheet():
     try:
-        jobs_sheet = gspread_client.open_by_key(SHEET_ID).worksheet("Jobs")
-        records = jobs_sheet.get_all_records(empty2zero=False, head=1)
-        return records
-    except gspread.WorksheetNotFound:
-        print("❌ Worksheet 'Jobs' NOT found. Check exact name and capitalization")
-        raise
+        return repository.get_records(JOBS)
     except Exception as e:
         print("⚠️ Failed to load jobs sheet:", e)
         raise
+
+
+class JobsSnapshot(NamedTuple):
+    jobs: List[Dict]         # every job, keys stripped
+    public_jobs: List[Dict]  # only jobs with status == "open"
+
+
+def load_jobs():
+    """
+    Load jobs once and precompute the normalized and public ("open") views.
+    """
+    records = load_jobs_sheet()
+    jobs = [{k.strip(): v for k, v in job.items()} for job in records]
+    public_jobs = [job for job in jobs if str(job.get("status", "")).strip().lower() == "open"]
+    return JobsSnapshot(jobs=jobs, public_jobs=public_jobs)
+
+
+# ----------------------------
+# Jobs cache (stale-while-revalidate)
+# ----------------------------
+jobs_cache = BackgroundRefresher("jobs", load_jobs, CACHE_DURATION)
+
+if sync is not None:
+    sync.on_synced.append(lambda counts: JOBS in counts and jobs_cache.trigger(force=True))
+
+
+def preload_jobs():
+    """Synchronously load jobs into the cache (used at startup)."""
+    if not jobs_cache.refresh():
+        raise Exception(f"Failed to load jobs: {jobs_cache.last_error}")
@@ -5,7 +5,7 @@ from pathlib import Path
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
 
 # Routers & utils
@@ -16,13 +16,19 @@ from routes.jobs_routes import router as jobs_router
 from utils.ip_location import router as ip_location_router
 from admin.admin_routes import router as admin_router
 
-from config.sheets import preload_tutors
-from config.recaptcha import verify_recaptcha
+from config.sheets import sync, tutor_cache, write_behind
+from config.http_client import start_http_client, close_http_client
+from config.ip_geolocation import start_ip_db_loader
+from utils import registration, warmup
+from utils.thumbnails import thumbnail_warmer
+from config.recaptcha import verify_recaptcha_async
+from config.settings import LOG_LEVEL
+from utils import metrics
 
 # --------------------------------------------------
 # Logging
 # --------------------------------------------------
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=LOG_LEVEL)
 logger = logging.getLogger("main")
 
 # --------------------------------------------------
@@ -62,8 +68,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers only show Server-Timing to cross-origin pages that are allowed to
+    expose_headers=["Server-Timing"],
 )
 
+# Outermost: latency histograms + Server-Timing for every request
+app.add_middleware(metrics.TimingMiddleware)
+
 # --------------------------------------------------
 # Serve React Static Files (ONLY if built)
 # --------------------------------------------------
@@ -92,18 +103,55 @@ def home():
 
 @app.get("/healthz")
 def health_check():
+    """Liveness: the process is up (tutors may still be loading)."""
     return {"status": "ok"}
 
+@app.get("/readyz")
+def readiness_check():
+    """Readiness: 200 once tutors are loaded, 503 while warming up."""
+    state = warmup.status()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus text format: route latency, upstream spans, cache hit rates."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # --------------------------------------------------
 # Startup Event
 # --------------------------------------------------
+@app.on_event("startup")
+async def start_shared_clients():
+    await start_http_client()
+    await registration.start_workers()
+
+
 @app.on_event("startup")
 def startup_event():
-    try:
-        preload_tutors()
-        logger.info("✅ Tutors preloaded successfully on startup")
-    except Exception as e:
-        logger.error(f"⚠️ Failed to preload tutors: {e}")
+    # Pre-render thumbnails for new / changed tutor photos after each refresh
+    tutor_cache.on_refresh.append(thumbnail_warmer.schedule)
+    # Optional local IP database loads in the background; ipapi.co until then
+    start_ip_db_loader()
+    # Replays rows journaled before the last shutdown, then flushes new ones
+    write_behind.start()
+    # Google clients, sheet sync and the first tutor / jobs load run in the
+    # background so the server accepts connections at once; see /readyz
+    warmup.start()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    warmup.stop()
+    if sync is not None:
+        sync.stop()
+    write_behind.stop()
+    thumbnail_warmer.shutdown()
+
+
+@app.on_event("shutdown")
+async def close_shared_clients():
+    await registration.stop_workers()
+    await close_http_client()
 
 # --------------------------------------------------
 # Tutor Register (Debug + reCAPTCHA)
@@ -124,7 +172,7 @@ async def register_tutor(request: Request):
         raise HTTPException(status_code=400, detail="Missing reCAPTCHA token")
 
     try:
-        verify_recaptcha(recaptcha_token, "tutor_register", request)
+        await verify_recaptcha_async(recaptcha_token, "tutor_register", request)
         logger.debug("reCAPTCHA verified")
     except HTTPException as e:
         raise HTTPException(status_code=400, detail=f"reCAPTCHA failed: {e.detail}")
@@ -0,0 +1,64 @@
+"""
+Response projections of a Tutor.
+
+Each view is an explicit field list, so nothing reaches a response unless
+it is named here. Public views (directory, profile, search card) never carry
+ID Card Number, Phone or the raw Image URL; only the admin view does.
+"""
+from typing import Dict
+
+from models.tutor import Tutor
+
+
+def card_view(t: Tutor) -> Dict:
+    """Search / nearby hit: enough to render a result card."""
+    return {
+        "Profile ID": t.profile_id,
+        "Name": t.name,
+        "Qualification": t.qualification,
+        "Subject": t.subject,
+        "Major Subjects": ",".join(t.major_subjects),
+        "Experience": t.experience,
+        "City": t.city,
+        "Latitude": t.latitude,
+        "Longitude": t.longitude,
+        "Verified": t.verified,
+        "Thumbnail": t.thumbnail,
+    }
+
+
+def public_view(t: Tutor) -> Dict:
+    """Entry of the public `/tutors/` directory."""
+    return {
+        "Profile ID": t.profile_id,
+        "Profile URL": t.profile_url,
+        "Name": t.name,
+        "Qualification": t.qualification,
+        "Subject": t.subject,
+        "Major Subjects": ",".join(t.major_subjects),
+        "Experience": t.experience,
+        "Bio": t.bio,
+        "Province": t.province,
+        "District": t.district,
+        "Tehsil": t.tehsil,
+        "City": t.city,
+        "Latitude": t.latitude,
+        "Longitude": t.longitude,
+        "Verified": t.verified,
+        "Thumbnail": t.thumbnail,
+    }
+
+
+def profile_view(t: Tutor) -> Dict:
+    """Public profile page: the directory entry plus the subjects as a list."""
+    return {**public_view(t), "Subjects": list(t.subjects)}
+
+
+def admin_view(t: Tutor) -> Dict:
+    """Everything, including contact and identity fields. Admin routes only."""
+    return {
+        **public_view(t),
+        "ID Card Number": t.id_card,
+        "Phone": t.phone,
+        "Image URL": t.image_url,
+    }
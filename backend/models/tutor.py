@@ -0,0 +1,140 @@
+import re
+import sys
+from typing import Dict, Optional, Tuple
+
+from utils.coordinates import parse_coordinates
+
+_DIGITS = re.compile(r"\d+")
+
+
+def _s(value) -> str:
+    """Safe string strip"""
+    return str(value).strip() if value else ""
+
+
+def _shared(value) -> str:
+    """Interned: provinces, cities, qualifications repeat across thousands of rows."""
+    return sys.intern(_s(value))
+
+
+class Tutor:
+    """
+    One tutor row, parsed once per refresh: numbers are numbers, subjects are
+    a tuple, and there is no per-row dict of sheet headers. Read-only by
+    convention; snapshots share instances between requests.
+    """
+
+    __slots__ = (
+        "profile_id",
+        "profile_url",
+        "name",
+        "id_card",
+        "qualification",
+        "subject",
+        "major_subjects",
+        "experience",
+        "phone",
+        "bio",
+        "province",
+        "district",
+        "tehsil",
+        "city",
+        "latitude",
+        "longitude",
+        "image_url",
+        "verified",
+    )
+
+    def __init__(
+        self,
+        profile_id: str,
+        name: str = "",
+        profile_url: str = "",
+        id_card: str = "",
+        qualification: str = "",
+        subject: str = "",
+        major_subjects: Tuple[str, ...] = (),
+        experience: int = 0,
+        phone: str = "",
+        bio: str = "",
+        province: str = "",
+        district: str = "",
+        tehsil: str = "",
+        city: str = "",
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        image_url: str = "",
+        verified: bool = False,
+    ):
+        self.profile_id = profile_id
+        self.profile_url = profile_url
+        self.name = name
+        self.id_card = id_card
+        self.qualification = qualification
+        self.subject = subject
+        self.major_subjects = major_subjects
+        self.experience = experience
+        self.phone = phone
+        self.bio = bio
+        self.province = province
+        self.district = district
+        self.tehsil = tehsil
+        self.city = city
+        self.latitude = latitude
+        self.longitude = longitude
+        self.image_url = image_url
+        self.verified = verified
+
+    @classmethod
+    def from_record(cls, r: Dict) -> "Tutor":
+        """Build from a sheet record (header -> value)."""
+        primary_subject = _shared(r.get("Subject"))
+
+        # Major subjects, deduplicated, excluding primary
+        major_subjects = []
+        for x in str(r.get("Major Subjects", "") or "").split(","):
+            x = sys.intern(x.strip())
+            if x and x != primary_subject and x not in major_subjects:
+                major_subjects.append(x)
+
+        m = _DIGITS.search(_s(r.get("Experience")))
+        coords = parse_coordinates(r.get("Latitude"), r.get("Longitude"))
+
+        return cls(
+            profile_id=_s(r.get("Profile ID")),
+            profile_url=_s(r.get("Profile URL")),
+            name=_s(r.get("Full Name")),
+            id_card=_s(r.get("ID Card Number")),
+            qualification=_shared(r.get("Qualification")),
+            subject=primary_subject,
+            major_subjects=tuple(major_subjects),
+            experience=int(m.group()) if m else 0,
+            phone=_s(r.get("Phone")),
+            bio=_s(r.get("Bio")),
+            province=_shared(r.get("Province")),
+            district=_shared(r.get("District")),
+            tehsil=_shared(r.get("Tehsil")),
+            city=_shared(r.get("City")),
+            latitude=coords[0] if coords else None,
+            longitude=coords[1] if coords else None,
+            image_url=_s(r.get("Image URL")),
+            verified=_s(r.get("Verified")).lower().startswith("y"),
+        )
+
+    @property
+    def subjects(self) -> Tuple[str, ...]:
+        """Primary subject first, then the major subjects."""
+        return ((self.subject,) if self.subject else ()) + self.major_subjects
+
+    @property
+    def coordinates(self) -> Optional[Tuple[float, float]]:
+        if self.latitude is None or self.longitude is None:
+            return None
+        return self.latitude, self.longitude
+
+    @property
+    def thumbnail(self) -> str:
+        return f"/tutors/image/{self.profile_id}"
+
+    def __repr__(self) -> str:
+        return f"Tutor({self.profile_id!r}, {self.name!r})"
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Dict
-from config.sheets import load_jobs_sheet
+import config.sheets as sheets
 from config.security import verify_request_origin
 
 # -------------------------
@@ -12,34 +12,34 @@ router = APIRouter(
     dependencies=[Depends(verify_request_origin)]  # Applied only to protected routes
 )
 
+# -------------------------
+# Cache helper
+# -------------------------
+def get_jobs_snapshot() -> sheets.JobsSnapshot:
+    """
+    Return the cached jobs snapshot. A stale snapshot is still served
+    while a single background refresh replaces it.
+    """
+    snapshot = sheets.jobs_cache.get()
+    if snapshot is None:
+        detail = sheets.jobs_cache.last_error or "jobs are still loading"
+        raise HTTPException(status_code=503, detail=f"Failed to load jobs: {detail}")
+    return snapshot
+
+
 # -------------------------
 # Admin / protected endpoint: fetch all jobs
 # -------------------------
 @router.get("/", response_model=Dict[str, List[Dict]])
 def get_jobs():
     """
-    Fetch all job listings from Google Sheets.
+    Fetch all job listings from the jobs cache.
     Protected by `verify_request_origin`.
 
     Returns:
         JSON object with `jobs` key containing all jobs as a list of dicts.
     """
-    try:
-        records = load_jobs_sheet()  # Returns list of dicts
-
-        # Return empty array if sheet has no jobs
-        if not records:
-            return {"jobs": []}
-
-        # Optional: normalize keys if needed
-        normalized = [
-            {k.strip(): v for k, v in job.items()} for job in records
-        ]
-
-        return {"jobs": normalized}
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to load jobs: {e}")
+    return {"jobs": get_jobs_snapshot().jobs}
 
 
 # -------------------------
@@ -49,27 +49,17 @@ def get_jobs():
 def get_public_jobs():
     """
     Public endpoint — does NOT require `verify_request_origin`.
-    Filters only jobs where status == "open".
+    Serves the precomputed list of jobs where status == "open".
 
     Returns:
         List of job dicts.
     """
-    try:
-        records = load_jobs_sheet()  # Returns list of dicts
-
-        if not records:
-            return []
-
-        # Normalize keys
-        normalized = [{k.strip(): v for k, v in job.items()} for job in records]
+    return get_jobs_snapshot().public_jobs
 
-        # Filter only open jobs
-        public_jobs = [
-            job for job in normalized
-            if str(job.get("status", "")).strip().lower() == "open"
-        ]
 
-        return public_jobs
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to load jobs: {e}")
+# -------------------------
+# Cache status
+# -------------------------
+@router.get("/cache-status")
+def jobs_cache_status():
+    return sheets.jobs_cache.status()
@@ -1,22 +1,41 @@
-from fastapi import APIRouter, Query, Depends
+from typing import Optional
+from fastapi import APIRouter, Query, Depends, Header
 from config.security import verify_request_origin
-from config.locations import pakistan_data
+from config.locations import (
+    pakistan_data,
+    DISTRICTS,
+    TEHSILS,
+    locations_payload,
+    location_index,
+)
 
 router = APIRouter(
     dependencies=[Depends(verify_request_origin)]
 )
 
+# The hierarchy only changes with a deploy; the ETag covers revalidation after that
+LOCATIONS_CACHE_CONTROL = "public, max-age=86400, stale-while-revalidate=604800"
+
+
 @router.get("/locations")
-def get_locations():
-    return pakistan_data
+def get_locations(
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    return locations_payload.response(accept_encoding, if_none_match, LOCATIONS_CACHE_CONTROL)
+
+@router.get("/locations/search")
+def search_locations(q: str = Query(..., min_length=1, max_length=100), limit: int = Query(20, ge=1, le=50)):
+    """Prefix search over province/district/tehsil/area names, with full paths."""
+    return {"results": location_index.search(q, limit)}
 
 @router.get("/districts")
 def get_districts(province: str = Query(...)):
-    return {"districts": list(pakistan_data.get(province, {}).keys())}
+    return {"districts": DISTRICTS.get(province, [])}
 
 @router.get("/tehsils")
 def get_tehsils(province: str, district: str):
-    return {"tehsils": list(pakistan_data.get(province, {}).get(district, {}).keys())}
+    return {"tehsils": TEHSILS.get((province, district), [])}
 
 @router.get("/areas")
 def get_areas(province: str, district: str, tehsil: str):
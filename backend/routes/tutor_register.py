@@ -1,22 +1,20 @@
 from fastapi import APIRouter, Form, File, UploadFile, HTTPException, Depends, Request
-from datetime import datetime
-import uuid
+from fastapi.responses import JSONResponse
+import asyncio
 import traceback
 
 from config.security import verify_request_origin
-from config.recaptcha import verify_recaptcha
-from config.imgbb import upload_to_imgbb
-from config.geocoder import geolocator
-import config.sheets as sheets
+from config.recaptcha import verify_recaptcha_async
 from config.sheets import is_id_registered
+from utils import registration
 
 router = APIRouter(
     dependencies=[Depends(verify_request_origin)]
 )
 
-@router.post("/tutors/register")
+@router.post("/tutors/register", status_code=202)
 async def register_tutor(
-    request: Request,  # <-- Added to inspect raw form data
+    request: Request,  # <-- client IP for reCAPTCHA
     # --- Security ---
     recaptcha_token: str = Form(...),
     
@@ -37,110 +35,99 @@ async def register_tutor(
     # --- Media ---
     image: UploadFile = File(None),
 ):
+    """
+    Validate and accept a registration, then finish it in the background
+    (image upload + reverse geocode in parallel, then the sheet append).
+    Returns 202 with a job id; poll `/tutors/register/{job_id}` for status.
+    """
     try:
-        # ---------- DEBUG: Print all incoming form keys ----------
-        form_data = await request.form()
-        print("Form keys received:", list(form_data.keys()))
-        # ---------------------------------------------------------
-
         # ------------------------------------
         # 1️⃣ Verify reCAPTCHA Enterprise
         # ------------------------------------
-        verify_recaptcha(recaptcha_token, "tutor_register", request)
+        await verify_recaptcha_async(recaptcha_token, "tutor_register", request)
 
         # ------------------------------------
-        # 2️⃣ Duplicate ID Check
+        # 2️⃣ Validate location
         # ------------------------------------
-        if is_id_registered(id_card):
-            raise HTTPException(status_code=400, detail="⚠️ This ID card is already registered.")
+        try:
+            latitude = float(lat) if lat else ""
+            longitude = float(lng) if lng else ""
+        except ValueError:
+            raise HTTPException(status_code=400, detail="⚠️ Invalid coordinates.")
 
         # ------------------------------------
-        # 3️⃣ Generate IDs & timestamps
-        # ------------------------------------
-        date_added = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-        profile_id = f"TUTOR-{uuid.uuid4().hex[:8].upper()}"
-        profile_url = f"https://theprofessoracademy.com/tutor/{profile_id}"
-
-        # ------------------------------------
-        # 4️⃣ Upload image
-        # ------------------------------------
-        image_url = await upload_to_imgbb(image)
-
+        # 3️⃣ Reserve the ID card (no await before it, so two concurrent
+        #    submissions of one ID card cannot both pass), then check the
+        #    stored rows off the event loop
         # ------------------------------------
-        # 5️⃣ Resolve location (if available)
-        # ------------------------------------
-        latitude = float(lat) if lat else ""
-        longitude = float(lng) if lng else ""
-
-        city = district = province = tehsil = ""
-        if latitude and longitude:
-            try:
-                loc = geolocator.reverse(f"{latitude}, {longitude}", timeout=10)
-                addr = loc.raw.get("address", {})
-                city = addr.get("city") or addr.get("town") or ""
-                district = addr.get("county") or ""
-                province = addr.get("state") or ""
-                tehsil = addr.get("suburb") or ""
-            except Exception:
-                pass
-
-        # ------------------------------------
-        # 6️⃣ Prepare subjects
-        # ------------------------------------
-        primary_subject = subject or ""
-        qualification_full = f"{qualification} {primary_subject}" if primary_subject else qualification
-
-        # Deduplicate major subjects and remove primary subject if included
-        major_list = [s.strip() for s in (major_subjects or "").split(",") if s.strip()]
-        major_filtered = sorted(set(s for s in major_list if s != primary_subject))
-        major_subjects_cleaned = ",".join(major_filtered)
-
-        # ---------- DEBUG LOGS ----------
-        print("Incoming primary subject:", primary_subject)
-        print("Incoming major subjects:", major_subjects)
-        print("Processed major subjects (cleaned):", major_subjects_cleaned)
-        # -------------------------------
-
-        # ------------------------------------
-        # 7️⃣ Append row to Google Sheet
-        # ⚠️ MUST MATCH COLUMN ORDER EXACTLY
-        # ------------------------------------
-        sheets.sheet.append_row([
-            date_added,              # Date Added
-            profile_id,              # Profile ID
-            profile_url,             # Profile URL
-            name,                    # Full Name
-            id_card,                 # ID Card Number
-            qualification_full,      # Qualification (degree + primary)
-            primary_subject,         # Primary Subject (just main subject)
-            major_subjects_cleaned,  # Major Subjects (no duplicates, exclude primary)
-            str(experience),         # Experience
-            phone,                   # Phone
-            bio,                     # Bio
-            province,                # Province
-            district,                # District
-            tehsil,                  # Tehsil
-            city,                    # City
-            str(latitude),           # Latitude
-            str(longitude),          # Longitude
-            image_url,               # Image URL
-            "No",                    # Verified
-        ])
+        if not registration.reserve(id_card):
+            raise HTTPException(status_code=400, detail="⚠️ This ID card is already registered.")
 
-        # ------------------------------------
-        # 8️⃣ Response
-        # ------------------------------------
-        return {
-            "message": "✅ Tutor registered successfully",
-            "profile_id": profile_id,
-            "profile_url": profile_url,
-        }
+        try:
+            if await asyncio.to_thread(is_id_registered, id_card):
+                raise HTTPException(status_code=400, detail="⚠️ This ID card is already registered.")
+
+            # ------------------------------------
+            # 4️⃣ Read the upload now (the file closes with the request)
+            # ------------------------------------
+            image_bytes = await image.read() if image and image.filename else None
+
+            # ------------------------------------
+            # 5️⃣ Queue the remote steps
+            # ------------------------------------
+            job = registration.submit(
+                {
+                    "name": name,
+                    "id_card": id_card,
+                    "qualification": qualification,
+                    "subject": subject,
+                    "major_subjects": major_subjects,
+                    "experience": experience,
+                    "phone": phone,
+                    "bio": bio,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                },
+                image_bytes,
+                image.filename if image else None,
+            )
+        except BaseException:
+            registration.release(id_card)
+            raise
+
+        # ------------------------------------
+        # 6️⃣ Response
+        # ------------------------------------
+        return JSONResponse(
+            status_code=202,
+            content={
+                "message": "✅ Tutor registration received",
+                "job_id": job["job_id"],
+                "status": job["status"],
+                "status_url": f"/tutors/register/{job['job_id']}",
+                "profile_id": job["profile_id"],
+                "profile_url": job["profile_url"],
+            },
+        )
 
     except HTTPException:
         raise
+    except registration.QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="⚠️ Too many registrations right now, please try again shortly."
+        )
     except Exception:
         traceback.print_exc()
         raise HTTPException(
             status_code=500,
             detail="❌ Failed to register tutor"
         )
+
+
+@router.get("/tutors/register/{job_id}")
+def registration_status(job_id: str):
+    job = registration.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Registration job not found")
+    return job
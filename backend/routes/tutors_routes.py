@@ -1,11 +1,27 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import StreamingResponse
-from datetime import datetime
-from io import BytesIO
-import requests
-from PIL import Image
+from fastapi import APIRouter, HTTPException, Depends, Query, Header
+from fastapi.responses import Response
+from typing import Optional
+import asyncio
 import config.sheets as sheets
 from config.security import verify_request_origin
+from models.responses import public_view
+from models.tutor import Tutor
+from utils import registration
+from utils.helpers import etag_matches
+from utils.thumbnails import (
+    CACHE_CONTROL,
+    DEFAULT_WIDTH,
+    VARIANT_WIDTHS,
+    get_thumbnail,
+    is_remote_image,
+    negotiate_format,
+    thumbnail_cache,
+    thumbnail_warmer,
+)
+from utils.tutor_search import MAX_PAGE_SIZE
+
+# Public tutor data: short browser cache, longer shared (CDN) cache, ETag revalidation
+TUTORS_CACHE_CONTROL = "public, max-age=60, s-maxage=300, stale-while-revalidate=600"
 
 router = APIRouter(
     prefix="/tutors",
@@ -13,21 +29,27 @@ router = APIRouter(
     dependencies=[Depends(verify_request_origin)]
 )
 
-thumbnail_cache = {}
-
 # ------------------------------
 # Cache helper
 # ------------------------------
 def refresh_cache_if_needed():
-    now = datetime.utcnow()
-    if not sheets.cached_tutors or (now - sheets.last_fetch_time) >= sheets.CACHE_DURATION:
-        try:
-            sheets.preload_tutors()
-        except Exception as e:
-            raise HTTPException(status_code=503, detail="Failed to load tutors")
-    if not sheets.cached_tutors:
+    """
+    Return the current tutor snapshot. A stale snapshot is still served
+    while a single background refresh replaces it.
+    """
+    snapshot = sheets.tutor_cache.get()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Tutors are still loading")
+    if not snapshot.tutors:
         raise HTTPException(status_code=503, detail="No verified tutors available")
-    return sheets.cached_tutors
+    return snapshot
+
+# ------------------------------
+# CACHE STATUS
+# ------------------------------
+@router.get("/cache-status")
+def cache_status():
+    return sheets.tutor_cache.status()
 
 # ------------------------------
 # DEBUG
@@ -35,9 +57,10 @@ def refresh_cache_if_needed():
 @router.get("/debug-sheet")
 def debug_sheet():
     try:
-        rows = sheets.sheet.get_all_records(empty2zero=False, head=1)
+        rows = sheets.repository.get_records(sheets.TUTORS)
         verified = [r for r in rows if str(r.get("Verified", "")).strip().lower().startswith("y")]
-        return {"total_rows": len(rows), "verified_count": len(verified), "preview": verified[:5]}
+        preview = [public_view(Tutor.from_record(r)) for r in verified[:5]]
+        return {"total_rows": len(rows), "verified_count": len(verified), "preview": preview}
     except Exception as e:
         return {"error": str(e)}
 
@@ -47,79 +70,118 @@ def debug_sheet():
 @router.get("/check-id")
 async def check_id_card(id_card: str = Query(..., min_length=13, max_length=13)):
     try:
-        return {"exists": sheets.is_id_registered(id_card)}
+        # A registration still being processed counts too
+        exists = registration.is_pending(id_card) or await asyncio.to_thread(sheets.is_id_registered, id_card)
+        return {"exists": exists}
     except Exception as e:
         return {"exists": False, "error": str(e)}
 
+# ------------------------------
+# THUMBNAIL CACHE STATUS
+# ------------------------------
+@router.get("/image-cache-status")
+def image_cache_status():
+    return {"cache": thumbnail_cache.stats(), "warmer": thumbnail_warmer.status()}
+
 # ------------------------------
 # THUMBNAIL
 # ------------------------------
 @router.get("/image/{profile_id}")
-def get_teacher_image(profile_id: str):
-    tutors = refresh_cache_if_needed()
-    tutor = next((t for t in tutors if t.get("Profile ID") == profile_id), None)
+def get_teacher_image(
+    profile_id: str,
+    size: int = Query(DEFAULT_WIDTH, description=f"One of {VARIANT_WIDTHS}"),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    if size not in VARIANT_WIDTHS:
+        raise HTTPException(status_code=400, detail=f"size must be one of {list(VARIANT_WIDTHS)}")
+
+    tutor = refresh_cache_if_needed().get(profile_id)
     if not tutor:
         raise HTTPException(status_code=404, detail="Teacher not found")
 
-    if profile_id in thumbnail_cache:
-        buffer = thumbnail_cache[profile_id]
-        buffer.seek(0)
-        return StreamingResponse(
-            buffer, media_type="image/jpeg", headers={"Cache-Control": "public, max-age=86400"}
-        )
-
-    image_url = tutor.get("Image URL")
-    if not image_url:
+    image_url = tutor.image_url
+    if not is_remote_image(image_url):
         raise HTTPException(status_code=404, detail="Image not found")
 
     try:
-        r = requests.get(image_url, timeout=10)
-        r.raise_for_status()
-        img = Image.open(BytesIO(r.content))
-
-        # Convert palette (P) or other non-RGB modes to RGB
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-
-        img.thumbnail((150, 150))
-        buffer = BytesIO()
-        img.save(buffer, format="JPEG", quality=55)
-        buffer.seek(0)
-        thumbnail_cache[profile_id] = buffer
-        buffer.seek(0)
-        return StreamingResponse(
-            buffer, media_type="image/jpeg", headers={"Cache-Control": "public, max-age=86400"}
-        )
-
+        image = get_thumbnail(image_url, size, negotiate_format(accept))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Image processing failed: {e}")
 
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": image.etag, "Vary": "Accept"}
+    if etag_matches(if_none_match, image.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=image.data, media_type=image.media_type, headers=headers)
+
 
 # ------------------------------
 # LIST ALL TUTORS
 # ------------------------------
 @router.get("/")
-def get_tutors():
-    tutors = refresh_cache_if_needed()
-    result = []
-    for t in tutors:
-        t_copy = t.copy()
-        pid = t_copy.get("Profile ID")
-        t_copy["Thumbnail"] = f"/tutors/image/{pid}"
-        t_copy.pop("Image URL", None)
-        result.append(t_copy)
-    return result
+def get_tutors(
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    snapshot = refresh_cache_if_needed()
+    return snapshot.directory.response(accept_encoding, if_none_match, TUTORS_CACHE_CONTROL)
+
+# ------------------------------
+# SEARCH (filtered + paginated)
+# ------------------------------
+@router.get("/search")
+def search_tutors(
+    city: Optional[str] = None,
+    subject: Optional[str] = None,
+    min_experience: Optional[int] = Query(None, ge=0),
+    qualification: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """
+    Filter verified tutors by city, subject, minimum years of experience and
+    qualification keyword. Returns one page of card fields, a `next_cursor`
+    for the following page, the total match count and city/subject facets.
+    """
+    snapshot = refresh_cache_if_needed()
+    try:
+        return snapshot.search.search(
+            city=city,
+            subject=subject,
+            min_experience=min_experience,
+            qualification=qualification,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# ------------------------------
+# NEARBY (spatial index)
+# ------------------------------
+@router.get("/nearby")
+def nearby_tutors(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(25, gt=0, le=500),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Verified tutors within `radius_km` of (lat, lng), nearest first.
+    """
+    snapshot = refresh_cache_if_needed()
+    return {"items": snapshot.nearby(lat, lng, radius_km, limit)}
 
 # ------------------------------
 # SINGLE PROFILE
 # ------------------------------
 @router.get("/profile/{profile_id}")
-def get_teacher(profile_id: str):
-    tutors = refresh_cache_if_needed()
-    tutor = next((t for t in tutors if t.get("Profile ID") == profile_id), None)
-    if not tutor:
+def get_teacher(
+    profile_id: str,
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    payload = refresh_cache_if_needed().profile_payload(profile_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Teacher not found")
-    t = tutor.copy()
-    t["Thumbnail"] = f"/tutors/image/{profile_id}"
-    t.pop("Image URL", None)
-    return t
+    return payload.response(accept_encoding, if_none_match, TUTORS_CACHE_CONTROL)
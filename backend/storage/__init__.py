@@ -0,0 +1,19 @@
+from storage.repository import Repository, TUTORS, JOBS
+from storage.sheets_repository import SheetsRepository
+from storage.sqlite_repository import SQLiteRepository
+from storage.sync import SheetSync
+from storage.write_behind import PendingWrites, WriteBehindRepository
+from storage.fake_sheet import FakeSpreadsheet, FakeWorksheet
+
+__all__ = [
+    "Repository",
+    "TUTORS",
+    "JOBS",
+    "SheetsRepository",
+    "SQLiteRepository",
+    "SheetSync",
+    "WriteBehindRepository",
+    "PendingWrites",
+    "FakeSpreadsheet",
+    "FakeWorksheet",
+]
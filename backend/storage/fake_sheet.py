@@ -0,0 +1,173 @@
+"""
+In-memory stand-ins for gspread's Spreadsheet / Worksheet.
+
+Only the subset of the gspread API this app uses is implemented, so the
+storage layer and routes can run against local data instead of Google.
+"""
+import copy
+import json
+import re
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+Cell = namedtuple("Cell", ["row", "col", "value"])
+
+
+def a1_to_rowcol(label: str):
+    """'B3' -> (3, 2)"""
+    m = re.match(r"^([A-Za-z]+)(\d+)$", label.strip())
+    if not m:
+        raise ValueError(f"Unsupported A1 label: {label}")
+    col = 0
+    for ch in m.group(1).upper():
+        col = col * 26 + (ord(ch) - ord("A") + 1)
+    return int(m.group(2)), col
+
+
+def parse_range(label: str):
+    """
+    'A2:C' / '1:1' / 'B2:B' -> (row1, col1, row2, col2); open ends are None.
+    """
+    bounds = []
+    for part in label.split(":"):
+        m = re.match(r"^([A-Za-z]*)(\d*)$", part.strip())
+        if not m:
+            raise ValueError(f"Unsupported A1 range: {label}")
+        letters, digits = m.groups()
+        col = 0
+        for ch in letters.upper():
+            col = col * 26 + (ord(ch) - ord("A") + 1)
+        bounds.append((int(digits) if digits else None, col or None))
+    (r1, c1), (r2, c2) = bounds[0], bounds[-1]
+    return r1, c1, r2, c2
+
+
+class FakeWorksheet:
+    def __init__(self, title: str, values: Optional[List[List]] = None, latency: float = 0.0):
+        self.title = title
+        self._values = [[str(v) for v in row] for row in (values or [])]
+        self.calls = 0  # API calls made against this worksheet
+        self.latency = latency  # seconds each API call blocks, like a round trip to Google
+
+    def _call(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    # ----------------------------
+    # Reads
+    # ----------------------------
+    @property
+    def row_count(self) -> int:
+        return len(self._values)
+
+    def get_all_values(self) -> List[List[str]]:
+        self._call()
+        return copy.deepcopy(self._values)
+
+    def get_all_records(self, empty2zero=False, head=1) -> List[Dict]:
+        self._call()
+        if len(self._values) < head:
+            return []
+        headers = self._values[head - 1]
+        records = []
+        for row in self._values[head:]:
+            padded = row + [""] * (len(headers) - len(row))
+            records.append({h: (0 if empty2zero and v == "" else v) for h, v in zip(headers, padded)})
+        return records
+
+    def row_values(self, row: int) -> List[str]:
+        self._call()
+        return list(self._values[row - 1]) if 0 < row <= len(self._values) else []
+
+    def _get_range(self, label: str) -> List[List[str]]:
+        r1, c1, r2, c2 = parse_range(label)
+        rows = self._values[(r1 or 1) - 1 : r2]
+        out = [row[(c1 or 1) - 1 : c2] for row in rows]
+        # Like the Sheets API: trailing empty cells and rows are trimmed
+        out = [row[: max((i + 1 for i, v in enumerate(row) if v != ""), default=0)] for row in out]
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def get(self, range_name: str, **kwargs) -> List[List[str]]:
+        self._call()
+        return self._get_range(range_name)
+
+    def batch_get(self, ranges: List[str], **kwargs) -> List[List[List[str]]]:
+        self._call()
+        return [self._get_range(label) for label in ranges]
+
+    def find(self, query: str) -> Optional[Cell]:
+        self._call()
+        for r, row in enumerate(self._values, start=1):
+            for c, value in enumerate(row, start=1):
+                if value == str(query):
+                    return Cell(r, c, value)
+        return None
+
+    # ----------------------------
+    # Writes
+    # ----------------------------
+    def _set(self, row: int, col: int, value):
+        while len(self._values) < row:
+            self._values.append([])
+        target = self._values[row - 1]
+        while len(target) < col:
+            target.append("")
+        target[col - 1] = "" if value is None else str(value)
+
+    def update_cell(self, row: int, col: int, value):
+        self._call()
+        self._set(row, col, value)
+
+    def update(self, values=None, range_name: str = "A1", **kwargs):
+        self._call()
+        start_row, start_col = a1_to_rowcol(range_name.split(":")[0])
+        for r, row in enumerate(values or []):
+            for c, value in enumerate(row):
+                self._set(start_row + r, start_col + c, value)
+
+    def batch_update(self, data: List[Dict], **kwargs):
+        self._call()
+        for item in data:
+            start_row, start_col = a1_to_rowcol(item["range"].split(":")[0])
+            for r, row in enumerate(item["values"]):
+                for c, value in enumerate(row):
+                    self._set(start_row + r, start_col + c, value)
+
+    def append_row(self, values: List, **kwargs):
+        self.append_rows([values])
+
+    def append_rows(self, values: List[List], **kwargs):
+        self._call()
+        for row in values:
+            self._values.append(["" if v is None else str(v) for v in row])
+
+    def clear(self):
+        self._call()
+        self._values = []
+
+
+class FakeSpreadsheet:
+    def __init__(self, sheets: Optional[Dict[str, List[List]]] = None, latency: float = 0.0):
+        self.latency = latency
+        self._worksheets = {
+            name: FakeWorksheet(name, values, latency) for name, values in (sheets or {}).items()
+        }
+
+    @classmethod
+    def from_json(cls, path: str) -> "FakeSpreadsheet":
+        """Load `{"Tutors": [[header...], [row...]], "Jobs": [...]}` from disk."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        if title not in self._worksheets:
+            raise KeyError(f"Worksheet '{title}' not found")
+        return self._worksheets[title]
+
+    def add_worksheet(self, title: str, rows=0, cols=0) -> FakeWorksheet:
+        self._worksheets[title] = FakeWorksheet(title, latency=self.latency)
+        return self._worksheets[title]
@@ -0,0 +1,100 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.helpers import normalize_id_card
+
+# Worksheet names used across the app
+TUTORS = "Tutors"
+JOBS = "Jobs"
+
+ID_CARD_HEADER = "ID Card Number"
+
+
+def _header_key(name) -> str:
+    return re.sub(r"[\s_]+", "", str(name)).casefold()
+
+
+def resolve_column(headers: List[str], key: str) -> Optional[int]:
+    """
+    0-based column of `key` in `headers`: an exact match first, then one
+    ignoring case, spaces and underscores (so the admin form's "FullName"
+    still finds the "Full Name" column).
+    """
+    if key in headers:
+        return headers.index(key)
+    wanted = _header_key(key)
+    for pos, name in enumerate(headers):
+        if _header_key(name) == wanted:
+            return pos
+    return None
+
+
+class Repository(ABC):
+    """
+    Storage interface for sheet-shaped data (header row + positional rows).
+
+    Records are returned as dicts keyed by header, in sheet order, exactly
+    like gspread's `get_all_records`, so record `i` lives on sheet row `i + 2`.
+    """
+
+    @abstractmethod
+    def get_headers(self, sheet: str) -> List[str]:
+        ...
+
+    @abstractmethod
+    def get_records(self, sheet: str) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def get_values(self, sheet: str) -> List[List]:
+        """Header row followed by the positional rows (`[]` for an empty sheet)."""
+
+    def last_row(self, sheet: str) -> int:
+        """Sheet row number of the last data row (1 when there are none)."""
+        return len(self.get_records(sheet)) + 1
+
+    @abstractmethod
+    def find_row(self, sheet: str, profile_id: str) -> Optional[int]:
+        """Return the sheet row number holding `profile_id`, or None."""
+
+    def find_rows(self, sheet: str, profile_ids: Iterable[str]) -> Tuple[Dict[str, int], int]:
+        """
+        Rows of many Profile IDs at once: `({profile_id: row}, last_row)`.
+        IDs that are not found are left out.
+        """
+        rows = {pid: self.find_row(sheet, pid) for pid in profile_ids}
+        return {pid: row for pid, row in rows.items() if row is not None}, self.last_row(sheet)
+
+    def id_card_exists(self, sheet: str, id_card: str) -> bool:
+        """True if any row (verified or not) holds this ID card number, dashes ignored."""
+        key = normalize_id_card(id_card)
+        return bool(key) and any(
+            normalize_id_card(record.get(ID_CARD_HEADER)) == key for record in self.get_records(sheet)
+        )
+
+    @abstractmethod
+    def append_row(self, sheet: str, values: List) -> None:
+        ...
+
+    def append_rows(self, sheet: str, rows: List[List]) -> None:
+        for values in rows:
+            self.append_row(sheet, values)
+
+    @abstractmethod
+    def update_cells(self, sheet: str, row: int, fields: Dict[str, object]) -> List[str]:
+        """
+        Update the given `{header: value}` cells of one row.
+        Returns the headers that were actually written.
+        """
+
+    def update_rows(self, sheet: str, changes: Dict[int, Dict[str, object]]) -> Dict[int, List[str]]:
+        """
+        Apply `{row: {header: value}}` edits to many rows at once.
+        Returns `{row: written_headers}`.
+        """
+        return {row: self.update_cells(sheet, row, fields) for row, fields in changes.items()}
+
+    @abstractmethod
+    def replace_values(self, sheet: str, values: List[List]) -> None:
+        """Overwrite the whole sheet with `values` (header row first)."""
@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from storage.repository import ID_CARD_HEADER, Repository, resolve_column
+from utils.helpers import normalize_id_card
+from utils.metrics import span
+
+logger = logging.getLogger("storage.sheets")
+
+
+def rowcol_to_a1(row: int, col: int) -> str:
+    """(3, 2) -> 'B3'"""
+    label = ""
+    while col:
+        col, rem = divmod(col - 1, 26)
+        label = chr(ord("A") + rem) + label
+    return f"{label}{row}"
+
+
+class SheetsRepository(Repository):
+    """
+    Repository that talks straight to gspread worksheets (or fakes of them).
+    Every call is a Sheets API round-trip, so the header row of each sheet
+    is cached (for `header_ttl` seconds, or until a sync sees it change)
+    and row edits go out as one `batch_update`.
+
+    Worksheets are either given up front or opened on first use through
+    `opener(title)`, so building the repository never touches the network.
+    """
+
+    UNKNOWN_FIELD_RECHECK = 30  # seconds
+
+    def __init__(
+        self,
+        worksheets: Optional[Dict[str, object]] = None,
+        header_ttl: float = 600,
+        opener: Optional[Callable[[str], object]] = None,
+    ):
+        self.worksheets = dict(worksheets or {})
+        self.opener = opener
+        self._open_lock = threading.Lock()
+        self.header_ttl = header_ttl
+        self._headers: Dict[str, tuple] = {}  # sheet -> (headers, fetched_at)
+        self._headers_lock = threading.Lock()
+
+    def worksheet(self, sheet: str):
+        ws = self.worksheets.get(sheet)
+        if ws is not None:
+            return ws
+        if self.opener is None:
+            raise KeyError(f"Worksheet '{sheet}' is not configured")
+        with self._open_lock:
+            if sheet not in self.worksheets:
+                with span("sheets_read"):
+                    self.worksheets[sheet] = self.opener(sheet)
+            return self.worksheets[sheet]
+
+    # ----------------------------
+    # Header cache
+    # ----------------------------
+    def get_headers(self, sheet: str, refresh: bool = False) -> List[str]:
+        cached = self._headers.get(sheet)
+        if refresh or cached is None or time.monotonic() - cached[1] > self.header_ttl:
+            with span("sheets_read"):
+                headers = [str(h).strip() for h in self.worksheet(sheet).row_values(1)]
+            self.set_headers(sheet, headers)
+            return headers
+        return list(cached[0])
+
+    def set_headers(self, sheet: str, headers: List[str]) -> None:
+        """Record the current header row (e.g. as seen by a full sync)."""
+        headers = [str(h).strip() for h in headers]
+        with self._headers_lock:
+            cached = self._headers.get(sheet)
+            if cached is not None and list(cached[0]) != headers:
+                logger.info(f"🔁 Header row of '{sheet}' changed; column map refreshed")
+            self._headers[sheet] = (tuple(headers), time.monotonic())
+
+    def invalidate_headers(self, sheet: Optional[str] = None) -> None:
+        with self._headers_lock:
+            if sheet is None:
+                self._headers.clear()
+            else:
+                self._headers.pop(sheet, None)
+
+    def resolve_columns(self, sheet: str, keys) -> Dict[str, int]:
+        """
+        Map field names to 1-based column numbers using the cached header
+        row. Unknown names trigger a header re-read (a column may have just
+        been added), at most once per `UNKNOWN_FIELD_RECHECK` seconds; names
+        that still do not match are left out.
+        """
+        headers = self.get_headers(sheet)
+        columns = {k: resolve_column(headers, k) for k in keys}
+        fetched_at = self._headers.get(sheet, ((), 0.0))[1]
+        if (
+            any(c is None for c in columns.values())
+            and time.monotonic() - fetched_at > self.UNKNOWN_FIELD_RECHECK
+        ):
+            headers = self.get_headers(sheet, refresh=True)
+            columns = {k: resolve_column(headers, k) for k in keys}
+        return {k: c + 1 for k, c in columns.items() if c is not None}
+
+    # ----------------------------
+    # Reads
+    # ----------------------------
+    def get_records(self, sheet: str) -> List[Dict]:
+        with span("sheets_read"):
+            return self.worksheet(sheet).get_all_records(empty2zero=False, head=1)
+
+    def get_values(self, sheet: str) -> List[List]:
+        with span("sheets_read"):
+            values = self.worksheet(sheet).get_all_values()
+        if values:
+            self.set_headers(sheet, values[0])
+        return values
+
+    def batch_get(self, sheet: str, ranges: List[str]) -> List[List[List]]:
+        """Read several A1 ranges of one sheet in a single API call."""
+        with span("sheets_read"):
+            blocks = self.worksheet(sheet).batch_get(ranges)
+        return [[list(row) for row in block] for block in blocks]
+
+    def find_row(self, sheet: str, profile_id: str) -> Optional[int]:
+        with span("sheets_read"):
+            cell = self.worksheet(sheet).find(profile_id)
+        return cell.row if cell else None
+
+    def find_rows(self, sheet: str, profile_ids: Iterable[str]) -> Tuple[Dict[str, int], int]:
+        """
+        One read of the Profile ID column instead of a `find` per ID. The
+        last row is the last one with a Profile ID (the API trims the
+        blank ones after it).
+        """
+        column = self.resolve_columns(sheet, ["Profile ID"]).get("Profile ID")
+        if column is None:
+            return {}, 1
+        letter = rowcol_to_a1(1, column)[:-1]
+        (block,) = self.batch_get(sheet, [f"{letter}2:{letter}"])
+        wanted = {str(pid).strip() for pid in profile_ids}
+        rows = {}
+        for offset, cells in enumerate(block):
+            value = str(cells[0]).strip() if cells else ""
+            if value in wanted:
+                rows.setdefault(value, offset + 2)
+        return rows, len(block) + 1
+
+    def id_card_exists(self, sheet: str, id_card: str) -> bool:
+        """One read of the ID card column rather than the whole sheet."""
+        key = normalize_id_card(id_card)
+        column = self.resolve_columns(sheet, [ID_CARD_HEADER]).get(ID_CARD_HEADER)
+        if not key or column is None:
+            return False
+        letter = rowcol_to_a1(1, column)[:-1]
+        (block,) = self.batch_get(sheet, [f"{letter}2:{letter}"])
+        return any(cells and normalize_id_card(cells[0]) == key for cells in block)
+
+    # ----------------------------
+    # Writes
+    # ----------------------------
+    def append_row(self, sheet: str, values: List) -> None:
+        with span("sheets_write"):
+            self.worksheet(sheet).append_row(values)
+
+    def append_rows(self, sheet: str, rows: List[List]) -> None:
+        with span("sheets_write"):
+            self.worksheet(sheet).append_rows(rows)
+
+    def update_cells(self, sheet: str, row: int, fields: Dict[str, object]) -> List[str]:
+        """Write all `fields` of one row with a single batch_update call."""
+        return self.update_rows(sheet, {row: fields})[row]
+
+    def update_rows(self, sheet: str, changes: Dict[int, Dict[str, object]]) -> Dict[int, List[str]]:
+        """Write every changed cell of every row with a single batch_update call."""
+        keys = {key for fields in changes.values() for key in fields}
+        columns = self.resolve_columns(sheet, keys)
+        data, written = [], {}
+        for row, fields in changes.items():
+            written[row] = [key for key in fields if key in columns]
+            data.extend(
+                {"range": rowcol_to_a1(row, columns[key]), "values": [[fields[key]]]}
+                for key in written[row]
+            )
+        if data:
+            with span("sheets_write"):
+                self.worksheet(sheet).batch_update(data)
+        return written
+
+    def replace_values(self, sheet: str, values: List[List]) -> None:
+        """Overwrite the whole worksheet with `values` (header row first)."""
+        ws = self.worksheet(sheet)
+        with span("sheets_write"):
+            ws.clear()
+            if values:
+                ws.update(values=values, range_name="A1")
+        self.set_headers(sheet, values[0] if values else [])
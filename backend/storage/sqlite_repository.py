@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from storage.repository import ID_CARD_HEADER, Repository, resolve_column
+from utils.helpers import normalize_id_card
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheet_headers (
+    sheet    TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name     TEXT NOT NULL,
+    PRIMARY KEY (sheet, position)
+);
+CREATE TABLE IF NOT EXISTS sheet_rows (
+    sheet      TEXT NOT NULL,
+    row_num    INTEGER NOT NULL,
+    profile_id TEXT,
+    id_card    TEXT,
+    data       TEXT NOT NULL,
+    row_hash   TEXT,
+    PRIMARY KEY (sheet, row_num)
+);
+CREATE INDEX IF NOT EXISTS idx_rows_profile_id ON sheet_rows (sheet, profile_id);
+CREATE INDEX IF NOT EXISTS idx_rows_id_card ON sheet_rows (sheet, id_card);
+"""
+
+# Columns pulled out of the JSON payload so they can be indexed
+INDEXED_COLUMNS = {"profile_id": "Profile ID", "id_card": ID_CARD_HEADER}
+
+
+def row_hash(values: List) -> str:
+    """Content hash of one (padded) row, as compared by incremental sync."""
+    payload = json.dumps(["" if v is None else str(v) for v in values], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class SQLiteRepository(Repository):
+    """
+    Local SQLite store mirroring the worksheets.
+
+    Rows keep their sheet row numbers so admin edits still address the same
+    row in Google Sheets. When `upstream` is given, writes go to it first
+    (write-through) and are then applied locally, so the mirror never holds
+    rows the sheet does not.
+    """
+
+    def __init__(self, path: str, upstream: Optional[Repository] = None):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.upstream = upstream
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        columns = {r[1] for r in self._conn.execute("PRAGMA table_info(sheet_rows)")}
+        if "row_hash" not in columns:
+            # Mirrors created before incremental sync; NULL hashes just re-sync once
+            self._conn.execute("ALTER TABLE sheet_rows ADD COLUMN row_hash TEXT")
+        self._conn.commit()
+
+    # ----------------------------
+    # Helpers
+    # ----------------------------
+    def _indexed_values(self, headers: List[str], values: List) -> Dict[str, str]:
+        out = {}
+        for column, header in INDEXED_COLUMNS.items():
+            pos = headers.index(header) if header in headers else -1
+            out[column] = str(values[pos]).strip() if 0 <= pos < len(values) else None
+        if out["id_card"] is not None:
+            # Indexed digits-only, so '35202-1234567-1' and '3520212345671' match
+            out["id_card"] = normalize_id_card(out["id_card"])
+        return out
+
+    def _pad(self, headers: List[str], values: List) -> List:
+        values = list(values)[: len(headers)]
+        return values + [""] * (len(headers) - len(values))
+
+    def _row_params(self, sheet: str, row_num: int, headers: List[str], values: List) -> tuple:
+        """`values` -> (sheet, row_num, profile_id, id_card, data, row_hash)"""
+        idx = self._indexed_values(headers, values)
+        return (sheet, row_num, idx["profile_id"], idx["id_card"], json.dumps(values), row_hash(values))
+
+    # ----------------------------
+    # Reads
+    # ----------------------------
+    def get_headers(self, sheet: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM sheet_headers WHERE sheet = ? ORDER BY position", (sheet,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def get_rows(self, sheet: str) -> List[List]:
+        """Positional rows in sheet order (without the header row)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM sheet_rows WHERE sheet = ? ORDER BY row_num", (sheet,)
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def get_values(self, sheet: str) -> List[List]:
+        headers = self.get_headers(sheet)
+        return [headers] + self.get_rows(sheet) if headers else []
+
+    def get_records(self, sheet: str) -> List[Dict]:
+        headers = self.get_headers(sheet)
+        return [dict(zip(headers, row)) for row in self.get_rows(sheet)]
+
+    def last_row(self, sheet: str) -> int:
+        with self._lock:
+            (last,) = self._conn.execute(
+                "SELECT COALESCE(MAX(row_num), 1) FROM sheet_rows WHERE sheet = ?", (sheet,)
+            ).fetchone()
+        return last
+
+    def find_row(self, sheet: str, profile_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT row_num FROM sheet_rows WHERE sheet = ? AND profile_id = ? LIMIT 1",
+                (sheet, str(profile_id).strip()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def find_rows(self, sheet: str, profile_ids) -> Tuple[Dict[str, int], int]:
+        wanted = {str(pid).strip() for pid in profile_ids}
+        index = self.row_index(sheet)
+        rows = {}
+        for row_num, profile_id, _ in index:
+            if profile_id in wanted:
+                rows.setdefault(profile_id, row_num)
+        return rows, (index[-1][0] if index else 1)
+
+    def row_index(self, sheet: str) -> List[Tuple[int, str, Optional[str]]]:
+        """`(row_num, profile_id, row_hash)` for every row, in sheet order."""
+        with self._lock:
+            return [
+                (r[0], r[1] or "", r[2])
+                for r in self._conn.execute(
+                    "SELECT row_num, profile_id, row_hash FROM sheet_rows WHERE sheet = ? ORDER BY row_num",
+                    (sheet,),
+                )
+            ]
+
+    def id_card_exists(self, sheet: str, id_card: str) -> bool:
+        """Local lookup; includes appended rows the sheet has not received yet."""
+        key = normalize_id_card(id_card)
+        if not key:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM sheet_rows WHERE sheet = ? AND id_card = ? LIMIT 1", (sheet, key)
+            ).fetchone()
+        return row is not None
+
+    # ----------------------------
+    # Writes
+    # ----------------------------
+    def append_row(self, sheet: str, values: List) -> None:
+        if self.upstream is not None:
+            self.upstream.append_row(sheet, values)
+
+        headers = self.get_headers(sheet)
+        with self._lock:
+            (last,) = self._conn.execute(
+                "SELECT COALESCE(MAX(row_num), 1) FROM sheet_rows WHERE sheet = ?", (sheet,)
+            ).fetchone()
+            values = self._pad(headers, values) if headers else list(values)
+            self._conn.execute(
+                "INSERT INTO sheet_rows (sheet, row_num, profile_id, id_card, data, row_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                self._row_params(sheet, last + 1, headers, values),
+            )
+            self._conn.commit()
+
+    def update_cells(self, sheet: str, row: int, fields: Dict[str, object]) -> List[str]:
+        return self.update_rows(sheet, {row: fields})[row]
+
+    def update_rows(self, sheet: str, changes: Dict[int, Dict[str, object]]) -> Dict[int, List[str]]:
+        """
+        Apply `{row: {header: value}}` edits. With an upstream, the upstream
+        write (one batch for all rows) happens first and decides what counts
+        as written; the local rows are then updated in one transaction.
+        """
+        written = None
+        if self.upstream is not None:
+            written = self.upstream.update_rows(sheet, changes)
+
+        headers = self.get_headers(sheet)
+        changed: Dict[int, List[str]] = {}
+        with self._lock:
+            for row, fields in changes.items():
+                changed[row] = []
+                current = self._conn.execute(
+                    "SELECT data FROM sheet_rows WHERE sheet = ? AND row_num = ?", (sheet, row)
+                ).fetchone()
+                if current is None:
+                    continue
+
+                values = self._pad(headers, json.loads(current[0]))
+                for key, value in fields.items():
+                    pos = resolve_column(headers, key)
+                    if pos is not None:
+                        values[pos] = value
+                        changed[row].append(key)
+
+                params = self._row_params(sheet, row, headers, values)
+                self._conn.execute(
+                    "UPDATE sheet_rows SET profile_id = ?, id_card = ?, data = ?, row_hash = ? WHERE sheet = ? AND row_num = ?",
+                    params[2:] + params[:2],
+                )
+            self._conn.commit()
+        return written if written is not None else changed
+
+    def replace_values(self, sheet: str, values: List[List]) -> None:
+        """
+        Replace a whole sheet mirror with `values` (header row first),
+        in a single transaction so readers never see a half-synced sheet.
+        """
+        headers = [str(h).strip() for h in values[0]] if values else []
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM sheet_headers WHERE sheet = ?", (sheet,))
+                self._conn.execute("DELETE FROM sheet_rows WHERE sheet = ?", (sheet,))
+                self._conn.executemany(
+                    "INSERT INTO sheet_headers (sheet, position, name) VALUES (?, ?, ?)",
+                    [(sheet, pos, name) for pos, name in enumerate(headers)],
+                )
+                rows = [
+                    self._row_params(sheet, offset + 2, headers, self._pad(headers, raw))
+                    for offset, raw in enumerate(values[1:])
+                ]
+                self._conn.executemany(
+                    "INSERT INTO sheet_rows (sheet, row_num, profile_id, id_card, data, row_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def upsert_rows(self, sheet: str, rows: Dict[int, List]) -> None:
+        """
+        Store `{row_num: values}` exactly as read from the sheet (no upstream
+        write), in one transaction. Used by incremental sync.
+        """
+        if not rows:
+            return
+        headers = self.get_headers(sheet)
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sheet_rows (sheet, row_num, profile_id, id_card, data, row_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        self._row_params(sheet, row_num, headers, self._pad(headers, values))
+                        for row_num, values in sorted(rows.items())
+                    ],
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,219 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from storage.repository import TUTORS, JOBS
+from storage.sheets_repository import SheetsRepository, rowcol_to_a1
+from storage.sqlite_repository import INDEXED_COLUMNS, SQLiteRepository, row_hash
+
+logger = logging.getLogger("storage.sync")
+
+# Columns people edit by hand in the sheet; read in full on every incremental pass
+WATCH_COLUMNS = ("Verified", "status")
+
+
+def _trim(headers: List[str]) -> List[str]:
+    """Drop trailing blank headers (the Sheets API omits them in ranges)."""
+    headers = list(headers)
+    while headers and not headers[-1]:
+        headers.pop()
+    return headers
+
+
+class SheetSync:
+    """
+    Mirrors worksheets between Google Sheets (`source`) and the local
+    SQLite store (`store`).
+
+    `pull` copies a worksheet into SQLite, `push` copies the local mirror
+    back out (used to seed a fresh or fake sheet). `pull_changes` is the
+    incremental pass: one `batch_get` reads the header row, the Profile ID
+    column, the `watch_columns` (e.g. Verified) in full, every row past the
+    last known one and a rotating window of `verify_window` existing rows,
+    and only rows that differ are written locally. So a hand-edited
+    Verified / status cell shows up on the next pass, while edits to other
+    columns wait for the window or a full pull. Header changes, or Profile IDs that no longer line
+    up (rows inserted, deleted or re-sorted), fall back to a full `pull`, as
+    does every `full_every`-th pass.
+
+    `start()` runs `pull_all` on a background thread every `interval`
+    seconds; callbacks in `on_synced` receive `{sheet: changed_rows}` for
+    the sheets that changed in that pass.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteRepository,
+        source: SheetsRepository,
+        sheets: Iterable[str] = (TUTORS, JOBS),
+        interval: float = 300,
+        incremental: bool = True,
+        verify_window: int = 200,
+        full_every: int = 12,
+        watch_columns: Iterable[str] = WATCH_COLUMNS,
+    ):
+        self.store = store
+        self.source = source
+        self.sheets = tuple(sheets)
+        self.interval = interval
+        self.incremental = incremental
+        self.verify_window = verify_window
+        self.full_every = full_every
+        self.watch_columns = tuple(watch_columns)
+        self.last_sync: Dict[str, float] = {}
+        self.last_error: Dict[str, str] = {}
+        self.on_synced: List[Callable[[Dict[str, int]], None]] = []
+        self._passes: Dict[str, int] = {}  # incremental passes since the last full pull
+        self._cursor: Dict[str, int] = {}  # first row of the next verify window
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def pull(self, sheet: str) -> int:
+        """
+        Copy one worksheet into the local store. Returns how many rows
+        differ from what was stored before (by row hash, deleted rows
+        included; every row if the header row changed), so an unchanged
+        sheet returns 0.
+        """
+        old_headers = self.store.get_headers(sheet)
+        old = {row_num: h for row_num, _, h in self.store.row_index(sheet)}
+        values = self.source.get_values(sheet)
+        self.store.replace_values(sheet, values)
+        new = {row_num: h for row_num, _, h in self.store.row_index(sheet)}
+        if self.store.get_headers(sheet) != old_headers:
+            changed = max(len(old), len(new), 1)
+        else:
+            changed = sum(1 for row_num in old.keys() | new.keys() if old.get(row_num) != new.get(row_num))
+        self._passes[sheet] = 0
+        self._cursor[sheet] = 2
+        self.last_sync[sheet] = time.time()
+        self.last_error.pop(sheet, None)
+        return changed
+
+    def pull_changes(self, sheet: str) -> int:
+        """
+        Incremental pull (see class docstring). Returns the number of rows
+        written locally; a full reload counts the rows that changed.
+        """
+        headers = self.store.get_headers(sheet)
+        key_header = INDEXED_COLUMNS["profile_id"]
+        index = self.store.row_index(sheet)
+        known = len(index)
+        if (
+            not headers
+            or key_header not in headers
+            or self._passes.get(sheet, self.full_every) >= self.full_every
+            or (index and index[-1][0] != known + 1)
+        ):
+            return self.pull(sheet)
+
+        key = rowcol_to_a1(2, headers.index(key_header) + 1)[:-1]
+        last = rowcol_to_a1(1, len(headers))[:-1]
+        start = self._cursor.get(sheet, 2)
+        if start > known + 1:
+            start = 2
+        end = min(start + self.verify_window - 1, known + 1)
+        watched = [headers.index(h) for h in self.watch_columns if h in headers] if known else []
+        ranges = ["1:1", f"{key}2:{key}", f"A{known + 2}:{last}"]
+        if known:
+            ranges.append(f"A{start}:{last}{end}")
+        for col in watched:
+            letter = rowcol_to_a1(1, col + 1)[:-1]
+            ranges.append(f"{letter}2:{letter}{known + 1}")
+
+        blocks = self.source.batch_get(sheet, ranges)
+        header_row = [str(h).strip() for h in (blocks[0][0] if blocks[0] else [])]
+        if _trim(header_row) != _trim(headers):
+            logger.info(f"🔁 Header row of '{sheet}' changed; full reload")
+            return self.pull(sheet)
+
+        keys = [str(row[0]).strip() if row else "" for row in blocks[1][:known]]
+        keys += [""] * (known - len(keys))
+        if keys != [profile_id for _, profile_id, _ in index]:
+            logger.info(f"🔁 Rows of '{sheet}' moved; full reload")
+            return self.pull(sheet)
+
+        changes = {known + 2 + offset: row for offset, row in enumerate(blocks[2])}
+        if known:
+            window = blocks[3]
+            hashes = {row_num: h for row_num, _, h in index}
+            for offset, row_num in enumerate(range(start, end + 1)):
+                values = window[offset] if offset < len(window) else []
+                padded = (list(values) + [""] * len(headers))[: len(headers)]
+                if row_hash(padded) != hashes[row_num]:
+                    changes[row_num] = values
+
+        if watched:
+            # Rows outside the window: patch changed watched cells into the stored row
+            local = self.store.get_rows(sheet)
+            for col, block in zip(watched, blocks[4:]):
+                for offset in range(known):
+                    row_num = offset + 2
+                    if start <= row_num <= end:
+                        continue  # read in full above
+                    cell = block[offset] if offset < len(block) else []
+                    value = str(cell[0]) if cell else ""
+                    row = changes.get(row_num) or local[offset]
+                    row = (list(row) + [""] * len(headers))[: len(headers)]
+                    if str(row[col]) != value:
+                        row[col] = value
+                        changes[row_num] = row
+
+        self.store.upsert_rows(sheet, changes)
+        self.source.set_headers(sheet, headers)
+        self._passes[sheet] = self._passes.get(sheet, 0) + 1
+        self._cursor[sheet] = end + 1
+        self.last_sync[sheet] = time.time()
+        self.last_error.pop(sheet, None)
+        return len(changes)
+
+    def push(self, sheet: str) -> int:
+        """Overwrite one worksheet with the local mirror. Returns the row count."""
+        values = self.store.get_values(sheet)
+        self.source.replace_values(sheet, values)
+        return max(len(values) - 1, 0)
+
+    def pull_all(self, full: bool = False) -> Dict[str, int]:
+        """
+        Pull every configured sheet (incrementally unless `full`); one
+        failing sheet does not stop the rest. Returns `{sheet: changed_rows}`
+        for the sheets that changed.
+        """
+        counts = {}
+        for sheet in self.sheets:
+            try:
+                changed = self.pull_changes(sheet) if self.incremental and not full else self.pull(sheet)
+                if changed:
+                    counts[sheet] = changed
+                    logger.info(f"✅ Synced {changed} changed rows from '{sheet}'")
+            except Exception as e:
+                self.last_error[sheet] = str(e)
+                logger.error(f"⚠️ Sync of '{sheet}' failed: {e}")
+        if counts:
+            for callback in self.on_synced:
+                try:
+                    callback(counts)
+                except Exception as e:
+                    logger.error(f"⚠️ Sync callback failed: {e}")
+        return counts
+
+    # ----------------------------
+    # Background job
+    # ----------------------------
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.pull_all()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sheet-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,257 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from storage.repository import ID_CARD_HEADER, Repository, resolve_column
+from utils.helpers import normalize_id_card
+
+logger = logging.getLogger("storage.write_behind")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_appends (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    sheet      TEXT NOT NULL,
+    data       TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class PendingWrites(Exception):
+    """Rows appended to a sheet are still in the journal, so row numbers are not final."""
+
+
+class WriteBehindRepository(Repository):
+    """
+    Wraps a repository (normally Google Sheets) so appended rows are first
+    committed to a local SQLite journal and then flushed upstream in batches
+    with `append_rows`.
+
+    - A flush runs when `batch_size` rows are pending or every
+      `flush_interval` seconds, on a background thread.
+    - A failed flush (quota 429s, outages) keeps the rows and retries with
+      exponential backoff.
+    - Rows still in the journal at startup are replayed by the first flush.
+
+    Delivery is at-least-once: if Sheets applies a batch but the response is
+    lost, that batch is sent again. Reads pass straight through to the
+    wrapped repository. Cell updates do too, but only once the sheet's
+    journaled rows are flushed: until then a row number may point past the
+    end of the real sheet, and the edit would land on an empty row. If the
+    flush fails, the update raises `PendingWrites` instead.
+    """
+
+    def __init__(
+        self,
+        inner: Repository,
+        journal_path: str,
+        batch_size: int = 50,
+        flush_interval: float = 5.0,
+        backoff_max: float = 300.0,
+    ):
+        if journal_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(journal_path)), exist_ok=True)
+        self.inner = inner
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backoff_max = backoff_max
+
+        self._conn = sqlite3.connect(journal_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._db_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self.flushed = 0
+        self.last_flush: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    # ----------------------------
+    # Pass-through
+    # ----------------------------
+    def get_headers(self, sheet: str) -> List[str]:
+        return self.inner.get_headers(sheet)
+
+    def get_records(self, sheet: str) -> List[Dict]:
+        return self.inner.get_records(sheet)
+
+    def get_values(self, sheet: str) -> List[List]:
+        return self.inner.get_values(sheet)
+
+    def last_row(self, sheet: str) -> int:
+        return self.inner.last_row(sheet)
+
+    def find_row(self, sheet: str, profile_id: str) -> Optional[int]:
+        return self.inner.find_row(sheet, profile_id)
+
+    def find_rows(self, sheet: str, profile_ids: Iterable[str]) -> Tuple[Dict[str, int], int]:
+        return self.inner.find_rows(sheet, profile_ids)
+
+    def id_card_exists(self, sheet: str, id_card: str) -> bool:
+        """Journaled rows count too: they are registrations the sheet has not received yet."""
+        key = normalize_id_card(id_card)
+        if not key:
+            return False
+        with self._db_lock:
+            journaled = [
+                json.loads(data)
+                for (data,) in self._conn.execute("SELECT data FROM pending_appends WHERE sheet = ?", (sheet,))
+            ]
+        if journaled:
+            pos = resolve_column(self.inner.get_headers(sheet), ID_CARD_HEADER)
+            if pos is not None and any(
+                pos < len(row) and normalize_id_card(row[pos]) == key for row in journaled
+            ):
+                return True
+        return self.inner.id_card_exists(sheet, id_card)
+
+    def update_cells(self, sheet: str, row: int, fields: Dict[str, object]) -> List[str]:
+        self._settle(sheet)
+        return self.inner.update_cells(sheet, row, fields)
+
+    def update_rows(self, sheet: str, changes: Dict[int, Dict[str, object]]) -> Dict[int, List[str]]:
+        self._settle(sheet)
+        return self.inner.update_rows(sheet, changes)
+
+    def _settle(self, sheet: str) -> None:
+        """Flush `sheet`'s journaled rows before a row-addressed write (see class docstring)."""
+        if not self.pending(sheet):
+            return
+        if time.monotonic() >= self._retry_at:
+            self.flush()
+        left = self.pending(sheet)
+        if left:
+            raise PendingWrites(
+                f"{left} new rows of '{sheet}' are not in the sheet yet"
+                + (f" ({self.last_error})" if self.last_error else "")
+            )
+
+    def replace_values(self, sheet: str, values: List[List]) -> None:
+        self.inner.replace_values(sheet, values)
+
+    # ----------------------------
+    # Journaled appends
+    # ----------------------------
+    def append_row(self, sheet: str, values: List) -> None:
+        self.append_rows(sheet, [values])
+
+    def append_rows(self, sheet: str, rows: List[List]) -> None:
+        """Durably journal `rows`; they reach the sheet on the next flush."""
+        now = time.time()
+        with self._db_lock:
+            self._conn.executemany(
+                "INSERT INTO pending_appends (sheet, data, created_at) VALUES (?, ?, ?)",
+                [(sheet, json.dumps(row), now) for row in rows],
+            )
+            self._conn.commit()
+        if self.pending() >= self.batch_size:
+            self._wake.set()
+
+    def pending(self, sheet: Optional[str] = None) -> int:
+        """Rows still in the journal (for one sheet, or all of them)."""
+        with self._db_lock:
+            if sheet is None:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM pending_appends").fetchone()
+            else:
+                (count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM pending_appends WHERE sheet = ?", (sheet,)
+                ).fetchone()
+        return count
+
+    def flush(self) -> int:
+        """
+        Send every pending row upstream, `batch_size` at a time, in journal
+        order. Stops at the first failure. Returns how many rows were sent.
+        """
+        sent = 0
+        with self._flush_lock:
+            while True:
+                with self._db_lock:
+                    first = self._conn.execute(
+                        "SELECT sheet FROM pending_appends ORDER BY id LIMIT 1"
+                    ).fetchone()
+                    if first is None:
+                        break
+                    batch = self._conn.execute(
+                        "SELECT id, data FROM pending_appends WHERE sheet = ? ORDER BY id LIMIT ?",
+                        (first[0], self.batch_size),
+                    ).fetchall()
+
+                try:
+                    self.inner.append_rows(first[0], [json.loads(data) for _, data in batch])
+                except Exception as e:
+                    self._failures += 1
+                    delay = min(2 ** self._failures, self.backoff_max)
+                    self._retry_at = time.monotonic() + delay
+                    self.last_error = str(e)
+                    logger.error(f"⚠️ Flushing {len(batch)} rows to '{first[0]}' failed (retry in {delay}s): {e}")
+                    break
+
+                with self._db_lock:
+                    self._conn.executemany(
+                        "DELETE FROM pending_appends WHERE id = ?", [(row_id,) for row_id, _ in batch]
+                    )
+                    self._conn.commit()
+                sent += len(batch)
+                self.flushed += len(batch)
+                self._failures = 0
+                self._retry_at = 0.0
+                self.last_error = None
+                self.last_flush = time.time()
+
+        if sent:
+            logger.info(f"✅ Flushed {sent} journaled rows")
+        return sent
+
+    # ----------------------------
+    # Background flusher
+    # ----------------------------
+    def _run(self):
+        while not self._stop.is_set():
+            wait = max(self._retry_at - time.monotonic(), 0) or self.flush_interval
+            self._wake.wait(wait)
+            self._wake.clear()
+            if time.monotonic() >= self._retry_at:
+                self.flush()
+
+    def start(self):
+        """Start the flusher; rows left over from a previous run go out first."""
+        if self._thread and self._thread.is_alive():
+            return
+        leftover = self.pending()
+        if leftover:
+            logger.info(f"🔁 Replaying {leftover} journaled rows")
+        self._stop.clear()
+        self._wake.set()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def status(self) -> dict:
+        return {
+            "pending": self.pending(),
+            "flushed": self.flushed,
+            "last_flush": self.last_flush,
+            "consecutive_failures": self._failures,
+            "retry_in_seconds": round(max(self._retry_at - time.monotonic(), 0), 1),
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,230 @@
+"""
+Storage layer against the in-memory fake sheet: the SQLite mirror, the
+write-behind journal and incremental sync.
+
+    cd backend && python -m pytest -q
+"""
+import pytest
+
+from storage import (
+    TUTORS,
+    FakeWorksheet,
+    PendingWrites,
+    Repository,
+    SheetsRepository,
+    SheetSync,
+    SQLiteRepository,
+    WriteBehindRepository,
+)
+
+HEADERS = ["Profile ID", "Full Name", "ID Card Number", "Verified"]
+
+
+def tutor_rows(count):
+    return [[f"TPA-{i:03d}", f"Tutor {i}", f"35{i:011d}", "No"] for i in range(1, count + 1)]
+
+
+class FlakyWorksheet(FakeWorksheet):
+    """Fails the next `failures` appends, like a 429 from the Sheets API."""
+
+    failures = 0
+
+    def append_rows(self, values, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("429 quota exceeded")
+        super().append_rows(values, **kwargs)
+
+
+@pytest.fixture
+def env(tmp_path):
+    ws = FlakyWorksheet(TUTORS, [HEADERS] + tutor_rows(10))
+    sheets = SheetsRepository({TUTORS: ws})
+    write_behind = WriteBehindRepository(sheets, str(tmp_path / "journal.db"))
+    store = SQLiteRepository(str(tmp_path / "store.db"), upstream=write_behind)
+    sync = SheetSync(store, sheets, sheets=[TUTORS], verify_window=3, full_every=100)
+    sync.pull(TUTORS)
+    yield ws, sheets, write_behind, store, sync
+    store.close()
+
+
+def sheet_rows(ws):
+    return ws.get_all_values()[1:]
+
+
+# ----------------------------
+# Interface
+# ----------------------------
+def test_repository_is_abstract():
+    with pytest.raises(TypeError):
+        Repository()
+
+
+# ----------------------------
+# SQLite mirror
+# ----------------------------
+def test_mirror_round_trip(env, tmp_path):
+    ws, sheets, write_behind, store, sync = env
+    assert store.get_values(TUTORS) == ws.get_all_values()
+    assert store.find_row(TUTORS, "TPA-004") == 5
+    assert store.id_card_exists(TUTORS, "3500000000004")
+    assert store.last_row(TUTORS) == 11
+
+    # Edits are written through to the sheet, then applied locally
+    assert store.update_cells(TUTORS, 5, {"Verified": "Yes", "Unknown": "x"}) == ["Verified"]
+    assert ws.get_all_values()[4][3] == "Yes"
+    assert store.get_records(TUTORS)[3]["Verified"] == "Yes"
+
+    # Pushing the mirror reproduces the sheet exactly
+    copy = FakeWorksheet(TUTORS)
+    SheetSync(store, SheetsRepository({TUTORS: copy}), sheets=[TUTORS]).push(TUTORS)
+    assert copy.get_all_values() == ws.get_all_values()
+
+    # And survives a reopen
+    reopened = SQLiteRepository(str(tmp_path / "store.db"))
+    assert reopened.get_values(TUTORS) == store.get_values(TUTORS)
+    reopened.close()
+
+
+def test_id_card_lookup_covers_unverified_and_unflushed_rows(env):
+    ws, sheets, write_behind, store, sync = env
+    store.append_row(TUTORS, ["TPA-011", "Tutor 11", "35202-1234567-1", "No"])
+
+    # Local store: every row, dashes ignored, before the flush
+    assert store.id_card_exists(TUTORS, "3500000000004")
+    assert store.id_card_exists(TUTORS, "3520212345671")
+    assert not store.id_card_exists(TUTORS, "3599999999999")
+
+    # Sheets-only backend: the journal, then one read of the ID card column
+    assert write_behind.id_card_exists(TUTORS, "3520212345671")
+    calls = ws.calls
+    assert write_behind.id_card_exists(TUTORS, "35000-0000000-4")
+    assert ws.calls - calls == 1
+    assert not write_behind.id_card_exists(TUTORS, "3599999999999")
+
+
+# ----------------------------
+# Write-behind
+# ----------------------------
+def test_write_behind_flushes_in_batches(env):
+    ws, sheets, write_behind, store, sync = env
+    write_behind.batch_size = 2
+    for row in tutor_rows(13)[10:]:
+        store.append_row(TUTORS, row)
+
+    # Visible locally at once, in the sheet only after a flush
+    assert store.last_row(TUTORS) == 14
+    assert len(sheet_rows(ws)) == 10
+    assert write_behind.pending() == 3
+
+    calls = ws.calls
+    assert write_behind.flush() == 3
+    assert ws.calls - calls == 2  # 2 + 1 rows
+    assert write_behind.pending() == 0
+    assert sheet_rows(ws) == tutor_rows(13)
+
+
+def test_write_behind_keeps_rows_and_retries(env, tmp_path):
+    ws, sheets, write_behind, store, sync = env
+    ws.failures = 1
+    store.append_row(TUTORS, tutor_rows(11)[-1])
+
+    assert write_behind.flush() == 0
+    assert write_behind.pending() == 1
+    assert write_behind.status()["consecutive_failures"] == 1
+    assert "429" in write_behind.last_error
+
+    # A restart replays the journal
+    replayed = WriteBehindRepository(sheets, str(tmp_path / "journal.db"))
+    assert replayed.pending() == 1
+    assert replayed.flush() == 1
+    assert replayed.last_error is None
+    assert sheet_rows(ws) == tutor_rows(11)
+    assert write_behind.pending() == 0
+
+
+def test_verify_before_flush_edits_the_new_row(env):
+    ws, sheets, write_behind, store, sync = env
+    store.append_row(TUTORS, tutor_rows(11)[-1])
+
+    # Row 12 only exists locally; the edit flushes it first instead of writing an empty row
+    assert store.update_cells(TUTORS, 12, {"Verified": "Yes"}) == ["Verified"]
+    assert write_behind.pending() == 0
+    assert sheet_rows(ws)[-1] == ["TPA-011", "Tutor 11", "3500000000011", "Yes"]
+    assert store.get_values(TUTORS) == ws.get_all_values()
+
+
+def test_edit_refused_while_flush_fails(env):
+    ws, sheets, write_behind, store, sync = env
+    ws.failures = 1
+    store.append_row(TUTORS, tutor_rows(11)[-1])
+
+    with pytest.raises(PendingWrites):
+        store.update_cells(TUTORS, 12, {"Verified": "Yes"})
+    assert len(sheet_rows(ws)) == 10
+    assert store.get_records(TUTORS)[-1]["Verified"] == "No"
+    assert write_behind.pending(TUTORS) == 1
+
+
+# ----------------------------
+# Incremental sync
+# ----------------------------
+def test_sync_unchanged_sheet_is_one_call(env):
+    ws, sheets, write_behind, store, sync = env
+    calls = ws.calls
+    assert sync.pull_changes(TUTORS) == 0
+    assert ws.calls - calls == 1
+
+
+def test_full_pull_counts_only_changed_rows(tmp_path):
+    # Sheets without a Profile ID column (Jobs) are always pulled in full
+    ws = FakeWorksheet("Jobs", [["Job ID", "status"], ["JOB-1", "open"], ["JOB-2", "open"]])
+    store = SQLiteRepository(str(tmp_path / "store.db"))
+    sync = SheetSync(store, SheetsRepository({"Jobs": ws}), sheets=["Jobs"])
+    synced = []
+    sync.on_synced.append(synced.append)
+
+    assert sync.pull_all() == {"Jobs": 2}
+    assert sync.pull_all() == {}
+    ws._set(3, 2, "closed")
+    assert sync.pull_all() == {"Jobs": 1}
+    ws._set(1, 2, "Status")
+    assert sync.pull_all() == {"Jobs": 2}
+    assert synced == [{"Jobs": 2}, {"Jobs": 1}, {"Jobs": 2}]
+    store.close()
+
+
+def test_sync_picks_up_edits(env):
+    ws, sheets, write_behind, store, sync = env
+    ws._set(3, 2, "Renamed")  # row 3 is in the first verify window
+    ws._set(10, 4, "Yes")     # Verified is read in full on every pass
+
+    assert sync.pull_changes(TUTORS) == 2
+    assert store.get_values(TUTORS) == ws.get_all_values()
+
+
+def test_sync_picks_up_appends(env):
+    ws, sheets, write_behind, store, sync = env
+    ws.append_rows(tutor_rows(12)[10:])
+
+    assert sync.pull_changes(TUTORS) == 2
+    assert store.last_row(TUTORS) == 13
+    assert store.get_values(TUTORS) == ws.get_all_values()
+
+
+def test_sync_reloads_after_delete(env):
+    ws, sheets, write_behind, store, sync = env
+    del ws._values[4]
+
+    assert sync.pull_changes(TUTORS) == 7  # full reload: rows 5-10 shifted up, row 11 gone
+    assert store.get_values(TUTORS) == ws.get_all_values()
+    assert store.find_row(TUTORS, "TPA-004") is None
+
+
+def test_sync_reloads_after_last_row_popped(env):
+    ws, sheets, write_behind, store, sync = env
+    ws._values.pop()
+
+    assert sync.pull_changes(TUTORS) == 1
+    assert store.last_row(TUTORS) == 10
+    assert store.get_values(TUTORS) == ws.get_all_values()
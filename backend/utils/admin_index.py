@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y")
+SORT_FIELDS = ("date_added", "row", "name")
+MAX_ADMIN_PAGE_SIZE = 200
+
+
+def _key(value) -> str:
+    return " ".join(str(value or "").split()).casefold()
+
+
+def _parse_date(value) -> datetime:
+    text = str(value or "").strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return datetime.min
+
+
+class AdminIndex:
+    """
+    Every Tutors row (verified or not) from one snapshot, for the admin
+    dashboard. Each record carries its sheet `Row`, and the sort orders and
+    filter sets are built once per snapshot.
+    """
+
+    def __init__(self, records: Sequence[Dict]):
+        rows: List[Dict] = []
+        verified, by_province, by_subject = set(), {}, {}
+        for pos, record in enumerate(records):
+            rows.append({"Row": pos + 2, **record})
+            if str(record.get("Verified", "")).strip().lower().startswith("y"):
+                verified.add(pos)
+            province = _key(record.get("Province"))
+            if province:
+                by_province.setdefault(province, set()).add(pos)
+            subjects = [record.get("Subject", "")] + str(record.get("Major Subjects", "")).split(",")
+            for subject in subjects:
+                if _key(subject):
+                    by_subject.setdefault(_key(subject), set()).add(pos)
+
+        self.rows = tuple(rows)
+        self.verified = frozenset(verified)
+        self.by_province = {k: frozenset(v) for k, v in by_province.items()}
+        self.by_subject = {k: frozenset(v) for k, v in by_subject.items()}
+
+        positions = range(len(rows))
+        self.order = {
+            "row": tuple(positions),
+            "date_added": tuple(sorted(positions, key=lambda p: (_parse_date(records[p].get("Date Added")), p))),
+            "name": tuple(sorted(positions, key=lambda p: (_key(records[p].get("Full Name")), p))),
+        }
+
+    def query(
+        self,
+        verified: Optional[bool] = None,
+        province: Optional[str] = None,
+        subject: Optional[str] = None,
+        sort: str = "date_added",
+        descending: bool = True,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> Dict:
+        page_size = max(1, min(page_size, MAX_ADMIN_PAGE_SIZE))
+        page = max(1, page)
+
+        filters = []
+        if verified is True:
+            filters.append(self.verified)
+        if province:
+            filters.append(self.by_province.get(_key(province), frozenset()))
+        if subject:
+            filters.append(self.by_subject.get(_key(subject), frozenset()))
+
+        order = self.order.get(sort, self.order["date_added"])
+        if descending:
+            order = order[::-1]
+        if filters or verified is False:
+            matched = frozenset.intersection(*filters) if filters else frozenset(range(len(self.rows)))
+            if verified is False:
+                matched = matched - self.verified
+            order = [p for p in order if p in matched]
+
+        start = (page - 1) * page_size
+        return {
+            "items": [self.rows[p] for p in order[start:start + page_size]],
+            "total": len(order),
+            "page": page,
+            "page_size": page_size,
+        }
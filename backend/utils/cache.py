@@ -0,0 +1,259 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger("utils.cache")
+
+_MISSING = object()
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    generation: int
+    loaded_at: float        # time.monotonic() of the successful load
+    loaded_at_utc: datetime
+
+
+class BackgroundRefresher:
+    """
+    Stale-while-revalidate holder for one expensive value (e.g. the tutor list).
+
+    - `get()` never blocks on the loader: it returns the last good value and,
+      if that value is older than `ttl`, kicks off a refresh on a background
+      thread.
+    - Only one refresh runs at a time (single-flight); concurrent callers just
+      keep reading the current entry. A forced trigger that arrives while a
+      refresh is running (e.g. right after an admin write) makes that refresh
+      run once more when it finishes, so the write is not missed.
+    - A successful load replaces the whole entry in one assignment, so readers
+      always see a consistent (value, generation) pair.
+    - A failed load keeps the last good value and backs off exponentially
+      before trying again.
+    - Callbacks in `on_refresh` are called as `callback(new_value, old_value)`
+      after each successful load.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        ttl: Union[timedelta, float],
+        backoff_base: float = 5.0,
+        backoff_max: float = 300.0,
+    ):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl.total_seconds() if isinstance(ttl, timedelta) else float(ttl)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._entry: Optional[CacheEntry] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._rerun = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self._failures = 0
+        self._retry_at = 0.0
+        self.last_error: Optional[str] = None
+        self.on_refresh: List[Callable[[Any, Any], None]] = []
+
+    # ----------------------------
+    # Reads
+    # ----------------------------
+    @property
+    def entry(self) -> Optional[CacheEntry]:
+        return self._entry
+
+    def get(self) -> Any:
+        """Current value (or None before the first successful load)."""
+        entry = self._entry
+        if entry is None or time.monotonic() - entry.loaded_at >= self.ttl:
+            self.trigger()
+        return entry.value if entry else None
+
+    def age(self) -> Optional[float]:
+        entry = self._entry
+        return time.monotonic() - entry.loaded_at if entry else None
+
+    def status(self) -> dict:
+        entry = self._entry
+        age = self.age()
+        return {
+            "name": self.name,
+            "generation": entry.generation if entry else 0,
+            "loaded_at": entry.loaded_at_utc.isoformat() + "Z" if entry else None,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "stale": age is None or age >= self.ttl,
+            "refreshing": self._refreshing,
+            "consecutive_failures": self._failures,
+            "retry_in_seconds": round(max(self._retry_at - time.monotonic(), 0), 1),
+            "last_error": self.last_error,
+        }
+
+    # ----------------------------
+    # Refresh
+    # ----------------------------
+    def _claim(self, force: bool) -> bool:
+        with self._lock:
+            if self._refreshing:
+                # The running load may predate the caller's write: go again after it
+                self._rerun = self._rerun or force
+                return False
+            if not force and time.monotonic() < self._retry_at:
+                return False
+            self._refreshing = True
+            self._idle.clear()
+            return True
+
+    def _load(self) -> bool:
+        """Load until no forced trigger arrived meanwhile; returns the last load's outcome."""
+        while True:
+            ok = self._load_once()
+            with self._lock:
+                if not self._rerun:
+                    self._refreshing = False
+                    self._idle.set()
+                    return ok
+                self._rerun = False
+
+    def _load_once(self) -> bool:
+        try:
+            value = self.loader()
+        except Exception as e:
+            self._failures += 1
+            delay = min(self.backoff_base * 2 ** (self._failures - 1), self.backoff_max)
+            self._retry_at = time.monotonic() + delay
+            self.last_error = str(e)
+            logger.error(f"⚠️ {self.name} refresh failed (retry in {delay:.0f}s): {e}")
+            return False
+        else:
+            previous = self._entry
+            self._entry = CacheEntry(
+                value=value,
+                generation=(previous.generation + 1) if previous else 1,
+                loaded_at=time.monotonic(),
+                loaded_at_utc=datetime.utcnow(),
+            )
+            self._failures = 0
+            self._retry_at = 0.0
+            self.last_error = None
+
+        for callback in self.on_refresh:
+            try:
+                callback(value, previous.value if previous else None)
+            except Exception as e:
+                logger.error(f"⚠️ {self.name} refresh callback failed: {e}")
+        return True
+
+    def trigger(self, force: bool = False) -> bool:
+        """
+        Start a background refresh unless one is running or we are backing off.
+        `force` skips the backoff window. Returns True if a refresh was started.
+        """
+        if not self._claim(force):
+            return False
+        threading.Thread(target=self._load, name=f"{self.name}-refresh", daemon=True).start()
+        return True
+
+    def refresh(self, timeout: Optional[float] = None) -> bool:
+        """
+        Refresh synchronously (startup / admin use). If a refresh is already
+        in flight, wait for it instead of starting another.
+        Returns True if the cache holds a value from a successful load.
+        """
+        if self._claim(force=True):
+            return self._load()
+        self._idle.wait(timeout)
+        return self._entry is not None and self.last_error is None
+
+
+class LRUCache:
+    """
+    Thread-safe LRU with optional per-entry TTL and an optional byte budget.
+
+    `max_entries` bounds the entry count; `max_bytes` (with `sizeof`, which
+    defaults to len()) bounds the total size of the stored values.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = len,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key, default=None, count: bool = True):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires_at, _ = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                    return value
+                self._remove(key)
+            if count:
+                self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # would evict everything else; not worth caching
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            expires_at = time.monotonic() + ttl if ttl else None
+            self._data[key] = (value, expires_at, size)
+            self.bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._data)))
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            self._remove(key)
+            return item[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def _remove(self, key) -> None:
+        _, _, size = self._data.pop(key)
+        self.bytes -= size
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import Optional
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for a while.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    `allow()` returns False for `reset_timeout` seconds. Then one trial call
+    is let through (half-open): success closes the breaker, failure opens it
+    again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "open_for_seconds": round(time.monotonic() - self.opened_at, 1) if self.opened_at else None,
+            }
@@ -8,3 +8,28 @@ def random_point_within_radius(lat, lng, radius_m=1000):
     lat_offset = w * math.cos(t)
     lng_offset = w * math.sin(t) / math.cos(math.radians(lat))
     return round(lat + lat_offset, 6), round(lng + lng_offset, 6)
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in km between two (lat, lng) points in degrees."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def parse_coordinates(lat, lng):
+    """
+    Parse sheet lat/lng strings into floats.
+    Returns None for blank, invalid, out-of-range or (0, 0) coordinates.
+    """
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180) or (lat == 0 and lng == 0):
+        return None
+    return lat, lng
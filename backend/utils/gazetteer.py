@@ -0,0 +1,52 @@
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from utils.spatial_index import SpatialIndex
+
+logger = logging.getLogger("gazetteer")
+
+
+class Gazetteer:
+    """
+    Offline nearest-place lookup over packaged centroids.
+
+    Each place is `{"province", "district", "tehsil", "city", "lat", "lng"}`.
+    Places whose province/district (and tehsil, when given) are not in the
+    `locations.json` hierarchy are dropped, so every answer uses the same
+    names as the registration form's dropdowns.
+    """
+
+    def __init__(self, places: List[Dict], hierarchy: Optional[Dict] = None):
+        kept = []
+        for place in places:
+            districts = (hierarchy or {}).get(place.get("province"), {})
+            tehsils = districts.get(place.get("district"))
+            if hierarchy is not None and (
+                tehsils is None or (place.get("tehsil") and place["tehsil"] not in tehsils)
+            ):
+                logger.warning(f"⚠️ Gazetteer place not in locations.json, skipped: {place}")
+                continue
+            kept.append(place)
+
+        self.places = tuple(kept)
+        self.index = SpatialIndex(
+            ((pos, float(p["lat"]), float(p["lng"])) for pos, p in enumerate(self.places)),
+            cell_deg=0.25,
+        )
+
+    @classmethod
+    def from_file(cls, path: str, hierarchy: Optional[Dict] = None) -> "Gazetteer":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), hierarchy)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def nearest(self, lat: float, lng: float, max_km: float) -> Optional[Tuple[float, Dict]]:
+        """(distance_km, place) of the closest place within `max_km`, else None."""
+        hits = self.index.nearest(lat, lng, limit=1, radius_km=max_km)
+        if not hits:
+            return None
+        distance, pos = hits[0]
+        return distance, self.places[pos]
@@ -0,0 +1,37 @@
+import re
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def digits_only(value) -> str:
+    return _NON_DIGITS.sub("", str(value or ""))
+
+
+def normalize_id_card(value) -> str:
+    """'35202-1234567-1' -> '3520212345671'"""
+    return digits_only(value)
+
+
+def normalize_phone(value) -> str:
+    """
+    Normalize Pakistani phone numbers to the local 0XXXXXXXXXX form, so
+    '+92 300 1234567', '0092-300-1234567' and '03001234567' compare equal.
+    """
+    digits = digits_only(value)
+    if digits.startswith("0092"):
+        digits = digits[2:]
+    if digits.startswith("92") and len(digits) == 12:
+        digits = "0" + digits[2:]
+    elif len(digits) == 10 and digits.startswith("3"):
+        digits = "0" + digits
+    return digits
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return etag in tags or f"W/{etag}" in tags
@@ -1,13 +1,10 @@
 from fastapi import APIRouter, Request
-import requests
+from config.ip_geolocation import locate_ip
 
 router = APIRouter(tags=["Utils"])
 
 @router.get("/utils/ip-location")
-def ip_location(request: Request):
-    try:
-        ip = request.client.host
-        r = requests.get(f"https://ipapi.co/{ip}/json/", timeout=5)
-        return r.json()
-    except Exception:
+async def ip_location(request: Request):
+    if request.client is None:
         return {}
+    return await locate_ip(request.client.host)
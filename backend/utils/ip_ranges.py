@@ -0,0 +1,66 @@
+import bisect
+import csv
+import gzip
+import ipaddress
+from typing import Dict, List, Optional, Tuple
+
+FIELDS = ("country_code", "country_name", "region", "city", "latitude", "longitude")
+
+
+def _to_int(value: str) -> Tuple[int, int]:
+    """'1.2.3.4' / '16909060' / '2001:db8::' -> (ip version, integer)"""
+    value = value.strip()
+    if value.isdigit():
+        n = int(value)
+        return (4 if n < 2 ** 32 else 6), n
+    addr = ipaddress.ip_address(value)
+    return addr.version, int(addr)
+
+
+class IPRangeDB:
+    """
+    Local IP-range database held as sorted arrays per IP version:
+    `starts[i]..ends[i]` maps to `records[i]`, found with one bisect.
+    """
+
+    def __init__(self, ranges: List[Tuple[int, int, int, Dict]] = ()):
+        self.starts: Dict[int, List[int]] = {4: [], 6: []}
+        self.ends: Dict[int, List[int]] = {4: [], 6: []}
+        self.records: Dict[int, List[Dict]] = {4: [], 6: []}
+        for version, start, end, record in sorted(ranges, key=lambda r: (r[0], r[1])):
+            self.starts[version].append(start)
+            self.ends[version].append(end)
+            self.records[version].append(record)
+
+    def __len__(self) -> int:
+        return len(self.starts[4]) + len(self.starts[6])
+
+    @classmethod
+    def from_csv(cls, path: str) -> "IPRangeDB":
+        opener = gzip.open if path.endswith(".gz") else open
+        ranges = []
+        with opener(path, "rt", encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                if len(row) < 2 + len(FIELDS) or not row[0].strip() or row[0].startswith("ip_"):
+                    continue
+                try:
+                    version, start = _to_int(row[0])
+                    _, end = _to_int(row[1])
+                    record = dict(zip(FIELDS, (v.strip() for v in row[2:])))
+                    record["latitude"] = float(record["latitude"])
+                    record["longitude"] = float(record["longitude"])
+                except ValueError:
+                    continue
+                ranges.append((version, start, end, record))
+        return cls(ranges)
+
+    def lookup(self, ip: str) -> Optional[Dict]:
+        try:
+            addr = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        n = int(addr)
+        i = bisect.bisect_right(self.starts[addr.version], n) - 1
+        if i >= 0 and self.ends[addr.version][i] >= n:
+            return self.records[addr.version][i]
+        return None
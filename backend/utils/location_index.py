@@ -0,0 +1,72 @@
+import bisect
+from typing import Dict, List
+
+LEVELS = ("province", "district", "tehsil", "area")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).casefold().replace("-", " ").split())
+
+
+class LocationIndex:
+    """
+    Sorted-prefix index over every province / district / tehsil / area name
+    in the location hierarchy.
+
+    Each name is indexed under every word it contains from that word on
+    ("Chak 62 Kot Jewan Mal" is also found by "kot jew"), so lookups are a
+    bisect into one sorted key list. Results carry the full path down to
+    the matched level.
+    """
+
+    def __init__(self, hierarchy: Dict):
+        self.entries: List[Dict] = []
+        for province, districts in hierarchy.items():
+            self._add({"province": province})
+            for district, tehsils in districts.items():
+                self._add({"province": province, "district": district})
+                for tehsil, areas in tehsils.items():
+                    self._add({"province": province, "district": district, "tehsil": tehsil})
+                    for area in areas:
+                        self._add({"province": province, "district": district, "tehsil": tehsil, "area": area})
+
+        keys = []
+        for pos, entry in enumerate(self.entries):
+            words = _normalize(entry["name"]).split(" ")
+            for i in range(len(words)):
+                keys.append((" ".join(words[i:]), i, pos))
+        keys.sort()
+        self.keys = [k for k, _, _ in keys]
+        self.positions = [(i, pos) for _, i, pos in keys]
+
+    def _add(self, path: Dict) -> None:
+        level = LEVELS[len(path) - 1]
+        self.entries.append({"name": path[level], "level": level, **path})
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Entries whose name (or a later word of it) starts with `query`.
+        Matches at the start of the name come first, then broader levels
+        (province before area), then alphabetical.
+        """
+        prefix = _normalize(query)
+        if not prefix:
+            return []
+
+        start = bisect.bisect_left(self.keys, prefix)
+        matched = {}
+        for k in range(start, len(self.keys)):
+            if not self.keys[k].startswith(prefix):
+                break
+            word, pos = self.positions[k]
+            matched[pos] = min(matched.get(pos, word), word)
+
+        ranked = sorted(
+            matched,
+            key=lambda pos: (
+                matched[pos] > 0,
+                LEVELS.index(self.entries[pos]["level"]),
+                _normalize(self.entries[pos]["name"]),
+            ),
+        )
+        return [dict(self.entries[pos]) for pos in ranked[:limit]]
@@ -0,0 +1,243 @@
+"""
+In-process metrics: counters, latency histograms and per-request spans.
+
+`span("sheets_read")` times one upstream call. The duration goes into the
+`upstream_duration_seconds` histogram and, when the call happens inside a
+request (including code offloaded with `asyncio.to_thread` /
+`run_in_threadpool`, which copy the request context), into that request's
+`Server-Timing` header. `render()` produces the Prometheus text format
+served on `/metrics`.
+"""
+import contextvars
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Seconds; covers cache hits (sub-ms) up to slow Sheets / Nominatim calls
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_request_spans: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "request_spans", default=None
+)
+
+
+def _labels(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self.values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            lines += [f"{self.name}{_format_labels(k)} {v}" for k, v in sorted(self.values.items())]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets=BUCKETS):
+        self.name, self.help = name, help
+        self.buckets = tuple(buckets)
+        self.values: Dict[LabelKey, list] = {}  # key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _labels(labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self.values.get(key)
+            if row is None:
+                row = self.values[key] = [0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in sorted(self.values.items())]
+        for key, row in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, row):
+                cumulative += n
+                le = _format_labels(key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {row[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {row[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {row[-1]}")
+        return lines
+
+
+# ----------------------------
+# Registry
+# ----------------------------
+request_duration = Histogram("http_request_duration_seconds", "Request latency by route template.")
+requests_total = Counter("http_requests_total", "Requests by route template and status code.")
+upstream_duration = Histogram("upstream_duration_seconds", "Upstream call latency by dependency.")
+upstream_errors = Counter("upstream_errors_total", "Failed upstream calls by dependency.")
+
+# name -> zero-arg callable returning {"hits": .., "misses": .., "entries": .., "bytes": ..}
+_caches: Dict[str, Callable[[], dict]] = {}
+# name -> zero-arg callable returning a number
+_gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+
+
+def watch_cache(name: str, stats: Callable[[], dict]) -> None:
+    """Export a cache's hit/miss counters (its `stats()` method) on /metrics."""
+    _caches[name] = stats
+
+
+def watch_gauge(name: str, help: str, read: Callable[[], float]) -> None:
+    _gauges[name] = (help, read)
+
+
+# ----------------------------
+# Spans
+# ----------------------------
+def start_request() -> contextvars.Token:
+    return _request_spans.set([])
+
+
+def end_request(token: contextvars.Token) -> List[Tuple[str, float]]:
+    spans = _request_spans.get() or []
+    _request_spans.reset(token)
+    return spans
+
+
+@contextmanager
+def span(name: str):
+    """Time one upstream call (see module docstring)."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        upstream_errors.inc(upstream=name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        upstream_duration.observe(elapsed, upstream=name)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((name, elapsed))
+
+
+_TOKEN = re.compile(r"[^A-Za-z0-9_\-]")
+
+
+def server_timing(spans: List[Tuple[str, float]], total: float) -> str:
+    """`Server-Timing` value: one entry per upstream (summed, with call count) plus the total."""
+    merged: Dict[str, List[float]] = {}
+    for name, elapsed in spans:
+        entry = merged.setdefault(name, [0.0, 0])
+        entry[0] += elapsed
+        entry[1] += 1
+    parts = [
+        f'{_TOKEN.sub("_", name)};dur={seconds * 1000:.1f}' + (f';desc="x{n}"' if n > 1 else "")
+        for name, (seconds, n) in merged.items()
+    ]
+    parts.append(f"app;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+# ----------------------------
+# Export
+# ----------------------------
+def render() -> str:
+    lines: List[str] = []
+    for metric in (request_duration, requests_total, upstream_duration, upstream_errors):
+        lines += metric.render()
+
+    hits = ["# HELP cache_hits_total Cache hits.", "# TYPE cache_hits_total counter"]
+    misses = ["# HELP cache_misses_total Cache misses.", "# TYPE cache_misses_total counter"]
+    entries = ["# HELP cache_entries Entries currently cached.", "# TYPE cache_entries gauge"]
+    size = ["# HELP cache_bytes Bytes currently cached.", "# TYPE cache_bytes gauge"]
+    for name, stats in sorted(_caches.items()):
+        try:
+            s = stats()
+        except Exception:
+            continue
+        label = f'{{cache="{_escape(name)}"}}'
+        hits.append(f"cache_hits_total{label} {s.get('hits', 0)}")
+        misses.append(f"cache_misses_total{label} {s.get('misses', 0)}")
+        entries.append(f"cache_entries{label} {s.get('entries', 0)}")
+        size.append(f"cache_bytes{label} {s.get('bytes', 0)}")
+    lines += hits + misses + entries + size
+
+    for name, (help, read) in sorted(_gauges.items()):
+        try:
+            value = read()
+        except Exception:
+            continue
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------------
+# Middleware
+# ----------------------------
+class TimingMiddleware:
+    """
+    ASGI middleware: times each HTTP request, adds a `Server-Timing` header
+    (upstream spans so far + total) and records the latency under the
+    matched route template, so `/tutors/profile/{profile_id}` is one series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        token = start_request()
+        spans = _request_spans.get()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                value = server_timing(spans, time.perf_counter() - started)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", value.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            labels = {"method": scope["method"], "route": path}
+            request_duration.observe(time.perf_counter() - started, **labels)
+            requests_total.inc(status=str(status), **labels)
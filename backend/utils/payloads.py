@@ -0,0 +1,74 @@
+import gzip
+import hashlib
+import json
+from typing import Dict, Optional, Sequence
+
+from fastapi.responses import Response
+
+from utils.helpers import etag_matches
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+GZIP_MIN_BYTES = 1024  # below this the gzip header outweighs the savings
+
+
+def pick_encoding(accept_encoding: Optional[str], available: Sequence[str]) -> str:
+    """First of `available` (in preference order) the client accepts, else identity."""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.replace(" ", "").lower()
+        if q.startswith("q=") and q[2:].strip("0.") == "":
+            continue  # q=0: explicitly refused
+        accepted.add(name.strip().lower())
+    for encoding in available:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return "identity"
+
+
+class RenderedJSON:
+    """
+    A JSON payload encoded once: the body, its gzip (and, if the brotli
+    package is installed, br) forms when worth it, and a strong ETag per
+    encoding derived from the body. `best` trades build time for size, for
+    payloads built once per deploy rather than once per refresh.
+    """
+
+    __slots__ = ("bodies", "etags")
+
+    def __init__(self, payload, tag: str = "", best: bool = False):
+        body = json.dumps(
+            payload, ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode("utf-8")
+        digest = (tag + "-" if tag else "") + hashlib.sha256(body).hexdigest()[:24]
+        self.bodies: Dict[str, bytes] = {"identity": body}
+        self.etags: Dict[str, str] = {"identity": f'"{digest}"'}
+        if len(body) >= GZIP_MIN_BYTES:
+            self.bodies["gzip"] = gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+            self.etags["gzip"] = f'"{digest}-gzip"'
+            if brotli is not None:
+                self.bodies["br"] = brotli.compress(body, quality=11 if best else 5)
+                self.etags["br"] = f'"{digest}-br"'
+
+    def response(
+        self,
+        accept_encoding: Optional[str],
+        if_none_match: Optional[str],
+        cache_control: str,
+    ) -> Response:
+        """The stored bytes as a Response (304 when the client's copy is current)."""
+        encoding = pick_encoding(accept_encoding, [e for e in ("br", "gzip") if e in self.bodies])
+        headers = {
+            "Cache-Control": cache_control,
+            "ETag": self.etags[encoding],
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(if_none_match, self.etags[encoding]):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.bodies[encoding], media_type="application/json", headers=headers)
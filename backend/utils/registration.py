@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import time
+import traceback
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import config.sheets as sheets
+from config.geocoder import EMPTY_LOCATION, reverse_geocode_async
+from config.imgbb import upload_image_bytes
+from config.settings import REGISTRATION_QUEUE_SIZE, REGISTRATION_WORKERS
+from utils.cache import LRUCache
+from utils.helpers import normalize_id_card
+from utils.metrics import watch_gauge
+
+logger = logging.getLogger("utils.registration")
+
+# Job states
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Finished jobs stay queryable for a day
+jobs = LRUCache(max_entries=10_000, ttl=24 * 3600)
+_pending_id_cards = set()
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+
+watch_gauge(
+    "registration_queue_depth",
+    "Registrations waiting for a worker.",
+    lambda: _queue.qsize() if _queue is not None else 0,
+)
+
+
+class QueueFull(Exception):
+    pass
+
+
+# ----------------------------
+# Row building
+# ----------------------------
+def build_row(form: Dict, image_url: str, location: Dict) -> List:
+    """
+    Tutors sheet row for one registration.
+    ⚠️ MUST MATCH COLUMN ORDER EXACTLY
+    """
+    primary_subject = form["subject"] or ""
+    qualification = form["qualification"]
+    qualification_full = f"{qualification} {primary_subject}" if primary_subject else qualification
+
+    # Deduplicate major subjects and remove primary subject if included
+    major_list = [s.strip() for s in (form["major_subjects"] or "").split(",") if s.strip()]
+    major_filtered = sorted(set(s for s in major_list if s != primary_subject))
+
+    return [
+        form["date_added"],            # Date Added
+        form["profile_id"],            # Profile ID
+        form["profile_url"],           # Profile URL
+        form["name"],                  # Full Name
+        form["id_card"],               # ID Card Number
+        qualification_full,            # Qualification (degree + primary)
+        primary_subject,               # Primary Subject (just main subject)
+        ",".join(major_filtered),      # Major Subjects (no duplicates, exclude primary)
+        str(form["experience"]),       # Experience
+        form["phone"],                 # Phone
+        form["bio"],                   # Bio
+        location["province"],          # Province
+        location["district"],          # District
+        location["tehsil"],            # Tehsil
+        location["city"],              # City
+        str(form["latitude"]),         # Latitude
+        str(form["longitude"]),        # Longitude
+        image_url,                     # Image URL
+        "No",                          # Verified
+    ]
+
+
+# ----------------------------
+# Jobs
+# ----------------------------
+def is_pending(id_card: str) -> bool:
+    """True while a registration for this ID card is still being processed."""
+    return normalize_id_card(id_card) in _pending_id_cards
+
+
+def reserve(id_card: str) -> bool:
+    """
+    Claim an ID card for one in-flight registration; False if another one
+    already holds it. Runs on the event loop with no await, so the check
+    and the claim cannot interleave with a concurrent request.
+    """
+    key = normalize_id_card(id_card)
+    if key in _pending_id_cards:
+        return False
+    _pending_id_cards.add(key)
+    return True
+
+
+def release(id_card: str) -> None:
+    """Give up a reservation whose registration was never queued."""
+    _pending_id_cards.discard(normalize_id_card(id_card))
+
+
+def submit(form: Dict, image: Optional[bytes], image_name: Optional[str]) -> Dict:
+    """
+    Queue a validated registration (its ID card already `reserve`d) and
+    return its job record. Raises QueueFull when the backlog is at capacity.
+    """
+    if _queue is None:
+        raise RuntimeError("Registration workers are not running")
+
+    now = datetime.utcnow()
+    profile_id = f"TUTOR-{uuid.uuid4().hex[:8].upper()}"
+    form = {
+        **form,
+        "date_added": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "profile_id": profile_id,
+        "profile_url": f"https://theprofessoracademy.com/tutor/{profile_id}",
+    }
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "status": QUEUED,
+        "profile_id": profile_id,
+        "profile_url": form["profile_url"],
+        "created_at": now.isoformat() + "Z",
+        "updated_at": now.isoformat() + "Z",
+        "error": None,
+    }
+    try:
+        _queue.put_nowait((job, form, image, image_name))
+    except asyncio.QueueFull:
+        raise QueueFull()
+
+    jobs.set(job["job_id"], job)
+    return job
+
+
+def get_job(job_id: str) -> Optional[Dict]:
+    return jobs.get(job_id)
+
+
+def _set_status(job: Dict, status: str, error: Optional[str] = None) -> None:
+    job["status"] = status
+    job["error"] = error
+    job["updated_at"] = datetime.utcnow().isoformat() + "Z"
+
+
+async def _locate(lat, lng) -> Dict:
+    if lat and lng:
+        return await reverse_geocode_async(lat, lng)
+    return dict(EMPTY_LOCATION)
+
+
+async def process(job: Dict, form: Dict, image: Optional[bytes], image_name: Optional[str]) -> None:
+    """
+    Run the remote steps for one registration: image upload and reverse
+    geocode concurrently, then the sheet append. A failed upload or geocode
+    degrades to "N/A" / blank location rather than losing the registration.
+    """
+    _set_status(job, PROCESSING)
+    started = time.monotonic()
+    try:
+        image_url, location = await asyncio.gather(
+            upload_image_bytes(image, image_name),
+            _locate(form["latitude"], form["longitude"]),
+            return_exceptions=True,
+        )
+        if isinstance(image_url, Exception):
+            logger.error(f"⚠️ Image upload failed for {job['profile_id']}: {image_url}")
+            image_url = "N/A"
+        if isinstance(location, Exception):
+            location = dict(EMPTY_LOCATION)
+
+        row = build_row(form, image_url, location)
+        await asyncio.to_thread(sheets.repository.append_row, sheets.TUTORS, row)
+        _set_status(job, COMPLETED)
+        logger.info(f"✅ Registered {job['profile_id']} in {time.monotonic() - started:.2f}s")
+    except Exception:
+        traceback.print_exc()
+        _set_status(job, FAILED, "❌ Failed to register tutor")
+    finally:
+        _pending_id_cards.discard(normalize_id_card(form["id_card"]))
+
+
+# ----------------------------
+# Workers
+# ----------------------------
+async def _worker() -> None:
+    while True:
+        job, form, image, image_name = await _queue.get()
+        try:
+            await process(job, form, image, image_name)
+        finally:
+            _queue.task_done()
+
+
+async def start_workers(count: int = REGISTRATION_WORKERS) -> None:
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=REGISTRATION_QUEUE_SIZE)
+        _workers.extend(asyncio.create_task(_worker()) for _ in range(max(1, count)))
+
+
+async def stop_workers(timeout: float = 30) -> None:
+    """Let queued registrations finish (up to `timeout`), then stop the workers."""
+    global _queue
+    if _queue is None:
+        return
+    try:
+        await asyncio.wait_for(_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        logger.error(f"⚠️ {_queue.qsize()} registrations still queued at shutdown")
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
@@ -0,0 +1,88 @@
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from models.responses import profile_view, public_view
+from models.tutor import Tutor
+from utils.admin_index import AdminIndex
+from utils.helpers import normalize_id_card, normalize_phone
+from utils.payloads import RenderedJSON
+from utils.spatial_index import SpatialIndex
+from utils.tutor_search import SearchIndex
+
+
+class TutorSnapshot:
+    """
+    One immutable generation of the tutor cache: the verified tutor list,
+    hash indexes built from it, the public payloads rendered from it and the
+    admin view over every raw sheet row. The cache swaps whole snapshots, so
+    the list and everything derived from it can never disagree.
+    """
+
+    __slots__ = (
+        "tutors", "by_profile_id", "by_id_card", "by_phone", "search", "spatial", "admin",
+        "directory", "_profiles",
+    )
+
+    def __init__(self, tutors: List[Tutor], records: Sequence[Dict] = ()):
+        by_profile_id: Dict[str, Tutor] = {}
+        by_id_card: Dict[str, Tutor] = {}
+        by_phone: Dict[str, List[Tutor]] = {}
+
+        for t in tutors:
+            if t.profile_id:
+                by_profile_id.setdefault(t.profile_id, t)
+            id_card = normalize_id_card(t.id_card)
+            if id_card:
+                by_id_card.setdefault(id_card, t)
+            phone = normalize_phone(t.phone)
+            if phone:
+                by_phone.setdefault(phone, []).append(t)
+
+        self.tutors: Tuple[Tutor, ...] = tuple(tutors)
+        self.by_profile_id: Mapping[str, Tutor] = MappingProxyType(by_profile_id)
+        self.by_id_card: Mapping[str, Tutor] = MappingProxyType(by_id_card)
+        self.by_phone: Mapping[str, Tuple[Tutor, ...]] = MappingProxyType(
+            {k: tuple(v) for k, v in by_phone.items()}
+        )
+        self.search = SearchIndex(self.tutors)
+        self.spatial = SpatialIndex(
+            (pos, t.latitude, t.longitude)
+            for pos, t in enumerate(self.tutors)
+            if t.coordinates
+        )
+        self.admin = AdminIndex(records)
+        # Public JSON, encoded once per generation instead of once per request
+        self.directory = RenderedJSON([public_view(t) for t in self.tutors], tag="tutors")
+        self._profiles: Dict[str, RenderedJSON] = {}
+
+    def __len__(self) -> int:
+        return len(self.tutors)
+
+    def get(self, profile_id: str) -> Optional[Tutor]:
+        return self.by_profile_id.get(profile_id)
+
+    def profile_payload(self, profile_id: str) -> Optional[RenderedJSON]:
+        """Rendered public profile, built on first request and kept for this generation."""
+        payload = self._profiles.get(profile_id)
+        if payload is None:
+            tutor = self.get(profile_id)
+            if tutor is None:
+                return None
+            payload = self._profiles.setdefault(profile_id, RenderedJSON(profile_view(tutor), tag="profile"))
+        return payload
+
+    def has_id_card(self, id_card: str) -> bool:
+        return normalize_id_card(id_card) in self.by_id_card
+
+    def find_by_phone(self, phone: str) -> Tuple[Tutor, ...]:
+        return self.by_phone.get(normalize_phone(phone), ())
+
+    def nearby(self, lat: float, lng: float, radius_km: float, limit: int) -> List[Dict]:
+        """Search cards of the nearest tutors, each with a `Distance KM` field."""
+        return [
+            {**self.search.cards[pos], "Distance KM": round(distance, 2)}
+            for distance, pos in self.spatial.nearest(lat, lng, limit=limit, radius_km=radius_km)
+        ]
+
+
+EMPTY_SNAPSHOT = TutorSnapshot([])
@@ -0,0 +1,118 @@
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.coordinates import EARTH_RADIUS_KM
+
+KM_PER_DEGREE = 111.32
+
+
+class SpatialIndex:
+    """
+    Uniform lat/lng grid over tutor locations for radius and k-nearest queries.
+
+    Points are bucketed into `cell_deg` cells with their radians and cos(lat)
+    precomputed, so a query only runs haversine over the rings of cells around
+    the query point and stops as soon as no unvisited ring can hold a closer
+    point than the current k-th best.
+    """
+
+    def __init__(self, points: Iterable[Tuple[int, float, float]], cell_deg: float = 0.01):
+        self.cell_deg = cell_deg
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float, float, int]]] = {}
+        max_abs_lat = 0.0
+        for pos, lat, lng in points:
+            lat_r, lng_r = math.radians(lat), math.radians(lng)
+            self.cells.setdefault(self._cell(lat, lng), []).append(
+                (lat_r, lng_r, math.cos(lat_r), pos)
+            )
+            max_abs_lat = max(max_abs_lat, abs(lat))
+        self.size = sum(len(v) for v in self.cells.values())
+        self._max_abs_lat = max_abs_lat
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    def _ring(self, ci: int, cj: int, r: int):
+        if r == 0:
+            yield ci, cj
+            return
+        for dj in range(-r, r + 1):
+            yield ci - r, cj + dj
+            yield ci + r, cj + dj
+        for di in range(-r + 1, r):
+            yield ci + di, cj - r
+            yield ci + di, cj + r
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        limit: int = 20,
+        radius_km: Optional[float] = None,
+    ) -> List[Tuple[float, int]]:
+        """
+        Up to `limit` (distance_km, position) pairs sorted by distance,
+        optionally restricted to `radius_km`.
+        """
+        if not self.size or limit <= 0:
+            return []
+
+        q_lat, q_lng = math.radians(lat), math.radians(lng)
+        q_cos = math.cos(q_lat)
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+        diameter = 2 * EARTH_RADIUS_KM
+
+        # Smallest km width of one cell anywhere between the query and the data
+        widest_lat = max(abs(lat), self._max_abs_lat)
+        cell_km = self.cell_deg * KM_PER_DEGREE * max(math.cos(math.radians(widest_lat)), 1e-6)
+
+        best: List[Tuple[float, int]] = []  # max-heap of (-distance, pos)
+        ci, cj = self._cell(lat, lng)
+
+        def scan(bucket):
+            for p_lat, p_lng, p_cos, pos in bucket:
+                a = sin((p_lat - q_lat) / 2) ** 2 + q_cos * p_cos * sin((p_lng - q_lng) / 2) ** 2
+                d = diameter * asin(min(1.0, sqrt(a)))
+                if radius_km is not None and d > radius_km:
+                    continue
+                if len(best) < limit:
+                    heapq.heappush(best, (-d, pos))
+                elif d < -best[0][0]:
+                    heapq.heapreplace(best, (-d, pos))
+
+        probed = 0  # grid cells looked at, empty or not
+        r = 0
+        while True:
+            # Everything in ring r is at least (r - 1) cells away
+            floor_km = max(r - 1, 0) * cell_km
+            if radius_km is not None and floor_km > radius_km:
+                break
+            if len(best) == limit and floor_km > -best[0][0]:
+                break
+
+            probed += 8 * r if r else 1
+            if probed > len(self.cells):
+                # Sparse around the query: rather than keep enumerating mostly
+                # empty rings, walk the occupied cells nearest-ring first
+                remaining = sorted((
+                    (max(abs(i - ci), abs(j - cj)), bucket)
+                    for (i, j), bucket in self.cells.items()
+                    if max(abs(i - ci), abs(j - cj)) >= r
+                ), key=lambda item: item[0])
+                for ring, bucket in remaining:
+                    floor_km = max(ring - 1, 0) * cell_km
+                    if radius_km is not None and floor_km > radius_km:
+                        break
+                    if len(best) == limit and floor_km > -best[0][0]:
+                        break
+                    scan(bucket)
+                break
+
+            for cell in self._ring(ci, cj, r):
+                bucket = self.cells.get(cell)
+                if bucket:
+                    scan(bucket)
+            r += 1
+
+        return sorted((-d, pos) for d, pos in best)
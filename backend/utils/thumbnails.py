@@ -0,0 +1,463 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, NamedTuple, Optional
+
+from PIL import Image
+
+from config.http_client import fetch_bytes_sync
+from config.settings import (
+    THUMBNAIL_CACHE_DIR,
+    THUMBNAIL_CACHE_MAX_BYTES,
+    THUMBNAIL_DISK_MAX_BYTES,
+    THUMBNAIL_WARM_WORKERS,
+)
+from utils.cache import LRUCache
+from utils.metrics import span, watch_cache, watch_gauge
+
+logger = logging.getLogger("utils.thumbnails")
+
+# Allowed output widths (px, bounding box); anything else is rejected
+VARIANT_WIDTHS = (150, 300, 600)
+DEFAULT_WIDTH = 150
+MAX_WIDTH = max(VARIANT_WIDTHS)
+
+JPEG_QUALITY = 55
+QUALITY = {"webp": 65, "avif": 50}
+MEDIA_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp", "avif": "image/avif"}
+
+# Variants rendered ahead of traffic (directory cards)
+WARM_VARIANTS = ((DEFAULT_WIDTH, "jpeg"), (DEFAULT_WIDTH, "webp"))
+
+CACHE_CONTROL = "public, max-age=86400"
+
+
+class CachedImage(NamedTuple):
+    data: bytes       # immutable, safe to hand to any number of responses
+    etag: str         # strong ETag (quoted content hash)
+    media_type: str
+
+
+def make_etag(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def thumbnail_key(image_url: str, variant: str = "150.jpeg") -> str:
+    """
+    Cache key for one rendering of one source image. Keyed on the image URL,
+    so a tutor uploading a new photo never gets the old thumbnail back.
+    """
+    return f"{variant}|{image_url}"
+
+
+# ----------------------------
+# Disk tier
+# ----------------------------
+class DiskImageStore:
+    """
+    Content-addressed image store that survives restarts.
+
+    blobs/<sha256>   the encoded bytes (identical renderings share one blob)
+    refs/<sha1(key)> "<sha256> <media_type>" pointing a cache key at a blob
+    Files are written to a temp name and renamed, so readers never see a
+    partial file.
+
+    Blobs are capped at `max_bytes`. A ref's mtime is its last use (touched
+    on every hit), and `prune` drops the least recently used refs until the
+    store is back under `PRUNE_TO` of the budget, deleting blobs no ref
+    points to any more (e.g. renderings of a photo the tutor replaced).
+    """
+
+    PRUNE_TO = 0.9
+    ORPHAN_GRACE = 60  # seconds; a blob written just before its ref is not an orphan
+
+    def __init__(self, root: str, max_bytes: int = THUMBNAIL_DISK_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.blobs = os.path.join(root, "blobs")
+        self.refs = os.path.join(root, "refs")
+        os.makedirs(self.blobs, exist_ok=True)
+        os.makedirs(self.refs, exist_ok=True)
+        self.used: Optional[int] = None  # blob bytes; measured by the first prune
+        self.pruned = 0
+        self._lock = threading.Lock()
+
+    def _ref_path(self, key: str) -> str:
+        return os.path.join(self.refs, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def _write(self, path: str, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def get(self, key: str) -> Optional[CachedImage]:
+        try:
+            with open(self._ref_path(key), "r", encoding="utf-8") as f:
+                digest, media_type = f.read().split(" ", 1)
+            with open(os.path.join(self.blobs, digest), "rb") as f:
+                data = f.read()
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(self._ref_path(key))  # recently used; pruned last
+        except OSError:
+            pass
+        return CachedImage(data, '"' + digest[:32] + '"', media_type)
+
+    def put(self, key: str, image: CachedImage) -> None:
+        digest = hashlib.sha256(image.data).hexdigest()
+        blob = os.path.join(self.blobs, digest)
+        with self._lock:
+            if not os.path.exists(blob):
+                self._write(blob, image.data)
+                if self.used is not None:
+                    self.used += len(image.data)
+            self._write(self._ref_path(key), f"{digest} {image.media_type}".encode("utf-8"))
+        if self.used is None or self.used > self.max_bytes:
+            self.prune()
+
+    def prune(self) -> None:
+        """Collect orphaned blobs, then evict least recently used refs while over budget."""
+        with self._lock:
+            refs = []  # (last_used, path, digest)
+            for entry in os.scandir(self.refs):
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        digest = f.read().split(" ", 1)[0]
+                    refs.append((entry.stat().st_mtime, entry.path, digest))
+                except (OSError, ValueError):
+                    continue
+            blobs = {}  # digest -> (size, mtime)
+            for entry in os.scandir(self.blobs):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                blobs[entry.name] = (st.st_size, st.st_mtime)
+
+            users: Dict[str, int] = {}
+            for _, _, digest in refs:
+                users[digest] = users.get(digest, 0) + 1
+            used = sum(size for size, _ in blobs.values())
+            before = used
+
+            def drop_blob(digest: str) -> None:
+                nonlocal used
+                try:
+                    os.remove(os.path.join(self.blobs, digest))
+                    used -= blobs.pop(digest)[0]
+                except OSError:
+                    pass
+
+            now = time.time()
+            for digest, (_, mtime) in list(blobs.items()):
+                if not users.get(digest) and now - mtime > self.ORPHAN_GRACE:
+                    drop_blob(digest)
+
+            if used > self.max_bytes:
+                target = self.max_bytes * self.PRUNE_TO
+                for _, path, digest in sorted(refs):
+                    if used <= target:
+                        break
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    users[digest] -= 1
+                    if not users[digest] and digest in blobs:
+                        drop_blob(digest)
+
+            self.used = used
+            self.pruned += before - used
+        if before > used:
+            logger.info(f"🧹 Thumbnail disk cache pruned {before - used} bytes ({used} in use)")
+
+
+# ----------------------------
+# Two-tier cache
+# ----------------------------
+class ThumbnailCache:
+    """Byte-bounded in-memory LRU in front of a `DiskImageStore`."""
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None):
+        self.memory = LRUCache(max_entries=100_000, max_bytes=max_bytes, sizeof=lambda img: len(img.data))
+        self.disk = DiskImageStore(directory) if directory else None
+        self.disk_hits = 0
+
+    def get(self, key: str) -> Optional[CachedImage]:
+        image = self.memory.get(key)
+        if image is None and self.disk is not None:
+            image = self.disk.get(key)
+            if image is not None:
+                self.disk_hits += 1
+                self.memory.set(key, image)
+        return image
+
+    def put(self, key: str, data: bytes, media_type: str) -> CachedImage:
+        image = CachedImage(data, make_etag(data), media_type)
+        self.memory.set(key, image)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, image)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not persist thumbnail: {e}")
+        return image
+
+    def stats(self) -> dict:
+        stats = {**self.memory.stats(), "disk_hits": self.disk_hits}
+        if self.disk is not None:
+            stats["disk_bytes"] = self.disk.used or 0
+            stats["disk_pruned_bytes"] = self.disk.pruned
+        return stats
+
+
+thumbnail_cache = ThumbnailCache(THUMBNAIL_CACHE_MAX_BYTES, THUMBNAIL_CACHE_DIR)
+watch_cache("thumbnails", thumbnail_cache.stats)
+watch_gauge(
+    "thumbnail_disk_bytes",
+    "Bytes of thumbnails in the disk tier.",
+    lambda: thumbnail_cache.disk.used or 0 if thumbnail_cache.disk else 0,
+)
+
+
+# ----------------------------
+# Rendering
+# ----------------------------
+def supported_formats():
+    """Output formats this Pillow build can encode, best first."""
+    Image.init()
+    return [f for f in ("avif", "webp") if f.upper() in Image.SAVE] + ["jpeg"]
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Pick the best image format the client accepts (`Accept` header)."""
+    accepted = set()
+    for part in (accept or "").lower().split(","):
+        media, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(media)
+    for fmt in supported_formats():
+        if f"image/{fmt}" in accepted:
+            return fmt
+    return "jpeg"
+
+
+def _quality(fmt: str, width: int) -> int:
+    if fmt == "jpeg":
+        return JPEG_QUALITY if width <= DEFAULT_WIDTH else 75
+    return QUALITY[fmt]
+
+
+def decode_original(raw: bytes) -> "Image.Image":
+    """
+    Decode a downloaded photo once into an RGB image no larger than the
+    biggest variant; every variant is resized from this.
+    """
+    with span("pil_decode"):
+        img = Image.open(BytesIO(raw))
+        img.draft("RGB", (MAX_WIDTH, MAX_WIDTH))  # cheap JPEG downscale while decoding
+
+        # Convert palette (P) or other non-RGB modes to RGB
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        img.thumbnail((MAX_WIDTH, MAX_WIDTH))
+        img.load()
+    return img
+
+
+def render_variant(original: "Image.Image", width: int, fmt: str) -> bytes:
+    with span("pil_resize"):
+        img = original.copy()
+        img.thumbnail((width, width))
+        buffer = BytesIO()
+        img.save(buffer, format=fmt.upper(), quality=_quality(fmt, width))
+    return buffer.getvalue()
+
+
+# Decoded originals, so several variants of one photo cost one download + decode
+_originals = LRUCache(max_entries=64, max_bytes=64 * 1024 * 1024, sizeof=lambda im: im.width * im.height * 3)
+_inflight: Dict[str, threading.Event] = {}
+_inflight_lock = threading.Lock()
+watch_cache("thumbnail_originals", _originals.stats)
+
+
+def load_original(image_url: str) -> "Image.Image":
+    """
+    Download and decode `image_url`, sharing one download between concurrent
+    callers (a request racing the warm-up pool, or a page full of cards).
+    Raises on download / decode errors.
+    """
+    original = _originals.get(image_url)
+    if original is not None:
+        return original
+
+    with _inflight_lock:
+        done = _inflight.get(image_url)
+        owner = done is None
+        if owner:
+            done = _inflight[image_url] = threading.Event()
+
+    if not owner:
+        done.wait(timeout=15)
+        original = _originals.get(image_url)
+        if original is not None:
+            return original
+
+    try:
+        with span("image_fetch"):
+            raw = fetch_bytes_sync(image_url)
+        original = decode_original(raw)
+        _originals.set(image_url, original)
+        return original
+    finally:
+        if owner:
+            with _inflight_lock:
+                _inflight.pop(image_url, None)
+            done.set()
+
+
+def get_thumbnail(image_url: str, width: int = DEFAULT_WIDTH, fmt: str = "jpeg") -> CachedImage:
+    """
+    Return the cached `width`/`fmt` variant for `image_url`, rendering it
+    from the (cached) decoded original on a miss.
+    """
+    key = thumbnail_key(image_url, f"{width}.{fmt}")
+    image = thumbnail_cache.get(key)
+    if image is not None:
+        return image
+
+    data = render_variant(load_original(image_url), width, fmt)
+    return thumbnail_cache.put(key, data, MEDIA_TYPES[fmt])
+
+
+def is_remote_image(image_url: str) -> bool:
+    return str(image_url or "").startswith(("http://", "https://"))
+
+
+# ----------------------------
+# Background warm-up
+# ----------------------------
+class ThumbnailWarmer:
+    """
+    Pre-renders thumbnails ahead of traffic on a bounded thread pool.
+
+    Hooked to the tutor cache: after every refresh, `schedule` queues tutors
+    whose Image URL is new or changed since the previous snapshot (on the
+    first snapshot: every image not already cached), plus earlier failures
+    that have not used up `max_attempts`.
+    """
+
+    def __init__(self, workers: int = 4, max_attempts: int = 3):
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued: Dict[str, str] = {}           # profile_id -> image_url
+        self.failures: Dict[str, dict] = {}         # profile_id -> details
+        self.scheduled = 0
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumb-warm")
+        return self._pool
+
+    def schedule(self, snapshot, previous=None) -> int:
+        """Queue changed images from `snapshot`. Returns how many were queued."""
+        queued = 0
+        for tutor in snapshot.tutors:
+            pid = tutor.profile_id
+            url = tutor.image_url
+            if not pid or not is_remote_image(url):
+                continue
+
+            failure = self.failures.get(pid)
+            if failure and failure["url"] == url:
+                if failure["attempts"] >= self.max_attempts:
+                    continue
+            elif previous is not None:
+                old = previous.get(pid)
+                if old is not None and old.image_url == url:
+                    continue
+            elif thumbnail_cache.get(thumbnail_key(url)) is not None:
+                self.skipped += 1
+                continue
+
+            with self._lock:
+                if self._queued.get(pid) == url:
+                    continue
+                self._queued[pid] = url
+                self.scheduled += 1
+            self._executor().submit(self._warm, pid, url)
+            queued += 1
+
+        if queued:
+            logger.info(f"🖼️ Queued {queued} thumbnails for warm-up")
+        return queued
+
+    def _warm(self, pid: str, url: str) -> None:
+        try:
+            for width, fmt in WARM_VARIANTS:
+                if fmt in supported_formats():
+                    get_thumbnail(url, width, fmt)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+                previous = self.failures.get(pid)
+                attempts = previous["attempts"] + 1 if previous and previous["url"] == url else 1
+                self.failures[pid] = {
+                    "url": url,
+                    "error": str(e),
+                    "attempts": attempts,
+                    "last_attempt": time.time(),
+                }
+        else:
+            with self._lock:
+                self.completed += 1
+                self.failures.pop(pid, None)
+        finally:
+            with self._lock:
+                if self._queued.get(pid) == url:
+                    del self._queued[pid]
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "scheduled": self.scheduled,
+                "completed": self.completed,
+                "failed": self.failed,
+                "skipped_cached": self.skipped,
+                "pending": len(self._queued),
+                "failures": dict(self.failures),
+            }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+thumbnail_warmer = ThumbnailWarmer(THUMBNAIL_WARM_WORKERS)
+
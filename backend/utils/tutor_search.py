@@ -0,0 +1,161 @@
+import base64
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+from models.responses import card_view
+from models.tutor import Tutor
+
+MAX_PAGE_SIZE = 100
+_WORD = re.compile(r"[\w+#.]+")
+
+
+def _key(value) -> str:
+    return " ".join(str(value or "").split()).casefold()
+
+
+def encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(str(position).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> int:
+    """Raises ValueError for malformed cursors and positions outside `range(size)`."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    position = int(base64.urlsafe_b64decode(padded.encode()).decode())
+    if not 0 <= position < size:
+        raise ValueError(f"cursor position {position} out of range")
+    return position
+
+
+class SearchIndex:
+    """
+    Inverted indexes over one tutor snapshot, built once per refresh.
+
+    Tutors are addressed by their position in the snapshot (sheet order), so
+    every index maps a casefolded key to a frozenset of positions and a page
+    is just the sorted intersection sliced after the cursor position.
+    The precomputed card dicts are shared between requests; never mutate them.
+    """
+
+    def __init__(self, tutors: Sequence[Tutor]):
+        by_city: Dict[str, set] = {}
+        by_subject: Dict[str, set] = {}
+        by_qualification_word: Dict[str, set] = {}
+        labels: Dict[str, str] = {}
+        city_keys: List[str] = []
+        subject_keys: List[tuple] = []
+        cards: List[Dict] = []
+        experience: List[tuple] = []
+
+        for pos, t in enumerate(tutors):
+            city = _key(t.city)
+            city_keys.append(city)
+            if city:
+                by_city.setdefault(city, set()).add(pos)
+                labels.setdefault(city, t.city)
+
+            subjects = []
+            for subject in t.subjects:
+                key = _key(subject)
+                if key not in subjects:
+                    subjects.append(key)
+                    by_subject.setdefault(key, set()).add(pos)
+                    labels.setdefault(key, subject)
+            subject_keys.append(tuple(subjects))
+
+            for word in _WORD.findall(_key(t.qualification)):
+                by_qualification_word.setdefault(word, set()).add(pos)
+
+            experience.append((t.experience, pos))
+            cards.append(card_view(t))
+
+        self.size = len(cards)
+        self.by_city = {k: frozenset(v) for k, v in by_city.items()}
+        self.by_subject = {k: frozenset(v) for k, v in by_subject.items()}
+        self.by_qualification_word = {k: frozenset(v) for k, v in by_qualification_word.items()}
+        self.labels = labels
+        self.city_keys = tuple(city_keys)
+        self.subject_keys = tuple(subject_keys)
+        self.cards = tuple(cards)
+
+        experience.sort()
+        self._experience_values = [e for e, _ in experience]
+        self._experience_positions = [p for _, p in experience]
+        self.all_facets = self._facets(range(self.size))
+
+    # ----------------------------
+    # Query
+    # ----------------------------
+    def _at_least(self, min_experience: int) -> FrozenSet[int]:
+        start = bisect_left(self._experience_values, min_experience)
+        return frozenset(self._experience_positions[start:])
+
+    def _facets(self, positions: Iterable[int]) -> Dict[str, Dict[str, int]]:
+        cities, subjects = Counter(), Counter()
+        for pos in positions:
+            if self.city_keys[pos]:
+                cities[self.city_keys[pos]] += 1
+            subjects.update(self.subject_keys[pos])
+        return {
+            "city": {self.labels[k]: n for k, n in cities.most_common()},
+            "subject": {self.labels[k]: n for k, n in subjects.most_common()},
+        }
+
+    def match(
+        self,
+        city: Optional[str] = None,
+        subject: Optional[str] = None,
+        min_experience: Optional[int] = None,
+        qualification: Optional[str] = None,
+    ) -> Optional[FrozenSet[int]]:
+        """Positions matching every given filter, or None when no filter is set."""
+        sets = []
+        if city:
+            sets.append(self.by_city.get(_key(city), frozenset()))
+        if subject:
+            sets.append(self.by_subject.get(_key(subject), frozenset()))
+        if qualification:
+            words = _WORD.findall(_key(qualification)) or [""]
+            sets.extend(self.by_qualification_word.get(w, frozenset()) for w in words)
+        if min_experience:
+            sets.append(self._at_least(min_experience))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def search(
+        self,
+        city: Optional[str] = None,
+        subject: Optional[str] = None,
+        min_experience: Optional[int] = None,
+        qualification: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Dict:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        after = decode_cursor(cursor, self.size) if cursor else -1
+
+        matched = self.match(city, subject, min_experience, qualification)
+        if matched is None:
+            total = self.size
+            page = list(range(after + 1, min(after + 1 + limit, self.size)))
+            facets = self.all_facets
+        else:
+            ordered = sorted(matched)
+            total = len(ordered)
+            start = bisect_left(ordered, after + 1)
+            page = ordered[start:start + limit]
+            facets = self._facets(ordered)
+
+        last = page[-1] if page else None
+        has_more = last is not None and (
+            last < self.size - 1 if matched is None else last < ordered[-1]
+        )
+        return {
+            "items": [self.cards[pos] for pos in page],
+            "total": total,
+            "next_cursor": encode_cursor(last) if has_more else None,
+            "facets": facets,
+        }
@@ -0,0 +1,132 @@
+"""
+Background warm-up after startup.
+
+The app starts accepting connections immediately; this thread then opens
+the Google clients, pulls the sheets into the local store and loads the
+tutor / jobs caches, retrying with backoff while Sheets is slow or down.
+`/readyz` reports `is_ready()`, so the orchestrator only routes traffic
+here once tutors are being served. `/healthz` stays a pure liveness check.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+import config.sheets as sheets
+from config.clients import clients
+
+logger = logging.getLogger("utils.warmup")
+
+RETRY_MAX_SECONDS = 60
+
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+_started_at: Optional[float] = None
+_ready_after: Optional[float] = None
+_phase = "pending"
+_attempts = 0
+
+
+def is_ready() -> bool:
+    """Ready once a tutor snapshot is loaded; jobs and clients may still be warming."""
+    global _ready_after
+    ready = sheets.tutor_cache.entry is not None
+    if ready and _ready_after is None and _started_at is not None:
+        _ready_after = time.monotonic() - _started_at
+    return ready
+
+
+def status() -> Dict:
+    ready = is_ready()
+    return {
+        "ready": ready,
+        "phase": _phase,
+        "attempts": _attempts,
+        "ready_after_seconds": round(_ready_after, 2) if _ready_after is not None else None,
+        "clients": clients.status(),
+        "tutors": sheets.tutor_cache.status(),
+        "jobs": sheets.jobs_cache.status(),
+    }
+
+
+def _set_phase(phase: str) -> None:
+    global _phase
+    _phase = phase
+    logger.info(f"🔥 Warm-up: {phase}")
+
+
+def _warm_clients() -> None:
+    # The spreadsheet pulls in the gspread client; reCAPTCHA loads its gRPC stack
+    for name in ("spreadsheet", "recaptcha"):
+        try:
+            clients.get(name)
+        except Exception as e:
+            logger.error(f"⚠️ Could not create {name} client: {e}")
+
+
+def _warm_up() -> None:
+    global _attempts
+
+    # Rows the local store kept from the last run can be served before Sheets answers
+    if sheets.sync is not None and sheets.repository.last_row(sheets.TUTORS) > 1:
+        _set_phase("local store")
+        sheets.tutor_cache.refresh()
+        if sheets.repository.last_row(sheets.JOBS) > 1:
+            sheets.jobs_cache.refresh()
+        is_ready()
+
+    _set_phase("clients")
+    _warm_clients()
+
+    delay = 1.0
+    jobs_loaded = False
+    while not _stop.is_set():
+        _attempts += 1
+        if sheets.sync is not None:
+            _set_phase("sheet sync")
+            sheets.sync.pull_all()
+            if not _stop.is_set():
+                sheets.sync.start()
+
+        _set_phase("tutors")
+        try:
+            sheets.preload_tutors()
+            logger.info("✅ Tutors preloaded successfully on startup")
+        except Exception as e:
+            logger.error(f"⚠️ Failed to preload tutors: {e}")
+
+        if not jobs_loaded:
+            _set_phase("jobs")
+            try:
+                sheets.preload_jobs()
+                jobs_loaded = True
+                logger.info("✅ Jobs preloaded successfully on startup")
+            except Exception as e:
+                # Not needed for readiness; jobs_cache retries on the next request
+                logger.error(f"⚠️ Failed to preload jobs: {e}")
+
+        if is_ready() and sheets.tutor_cache.last_error is None:
+            _set_phase("done")
+            return
+
+        _set_phase(f"retrying in {delay:.0f}s")
+        if _stop.wait(delay):
+            return
+        delay = min(delay * 2, RETRY_MAX_SECONDS)
+
+
+def start() -> None:
+    """Begin warming up in a background thread (startup; returns immediately)."""
+    global _thread, _started_at
+    if _thread and _thread.is_alive():
+        return
+    _stop.clear()
+    _started_at = time.monotonic()
+    _thread = threading.Thread(target=_warm_up, name="warm-up", daemon=True)
+    _thread.start()
+
+
+def stop(timeout: float = 5) -> None:
+    _stop.set()
+    if _thread:
+        _thread.join(timeout=timeout)
@@ -216,7 +216,8 @@ export default function TutorRegistration() {
         headers: { "Content-Type": "multipart/form-data" },
       });
 
-      if (res.status === 200) {
+      // 202: accepted, the profile is finished in the background
+      if (res.status === 200 || res.status === 202) {
         setMessage("✅ Tutor registered successfully!");
         setFormData({
           name: "",